@@ -0,0 +1,217 @@
+"""
+Stapelanalyse von Stellungen (nur auf dem Host).
+
+Liest Stellungen zeilenweise aus einer Datei oder stdin, bewertet sie mit
+fester Tiefe oder festem Zeitbudget in einem Prozess-Pool und schreibt je
+Stellung eine JSON-Zeile in derselben Reihenfolge zurück. Es sind höchstens
+--inflight Stellungen gleichzeitig unterwegs, der Speicherbedarf hängt also
+nicht von der Größe der Eingabe ab.
+
+Eingabeformate (eine Stellung pro Zeile, '#' leitet Kommentare ein):
+    Zugfolge:    Spalten 1..7, der Spieler beginnt, z. B. 4453 ('-' ist die
+                 Startstellung)
+    Spaltenform: 7 Spalten getrennt durch '/', je Spalte die Steine von unten
+                 nach oben mit x (Spieler) und o (KI), z. B. xo//x/o///
+
+Ausgabe je Zeile (JSON):
+    line, input, to_move ('player' oder 'ai'), col (1..7), value (aus Sicht
+    der KI wie minimax), depth, ms; bei ungültiger Eingabe stattdessen error.
+
+Aufruf:
+    python analyse.py stellungen.txt --depth 8 > ergebnisse.jsonl
+    python analyse.py - --time-ms 500 --workers 4 < stellungen.txt
+"""
+import collections
+import json
+import multiprocessing
+import sys
+import time
+
+from game_logic import create_board, minimax, iterative_deepening, is_terminal_node, ROWS, COLS
+from transposition import TranspositionTable, TT_SIZE
+from ordering import MoveOrdering
+
+DEPTH = 6  # Standard-Suchtiefe
+INFLIGHT_PER_WORKER = 4  # Gleichzeitig unterwegs befindliche Stellungen je Worker
+PIECE_CODES = {'x': 0, 'o': 1}  # Spaltenform: Zeichen -> Spielerindex
+
+# Zustand je Worker-Prozess (über _init_worker gesetzt)
+_tt = None
+
+
+def parse_position(text):
+    """
+    Liest eine Stellung im Zugfolge- oder Spaltenformat.
+
+    Parameter:
+        text: Eingabezeile ohne Kommentar und Leerzeichen
+
+    Rückgabe:
+        Die Position.
+
+    Löst ValueError bei ungültiger Eingabe aus.
+    """
+    board = create_board()
+    if text == '-':
+        return board  # Startstellung
+    if '/' in text:
+        columns = text.split('/')
+        if len(columns) != COLS:
+            raise ValueError("Spaltenform braucht " + str(COLS) + " Spalten")
+        counts = [0, 0]
+        for col, stones in enumerate(columns):
+            if len(stones) > ROWS:
+                raise ValueError("Spalte " + str(col + 1) + " ist zu hoch")
+            for stone in stones:
+                if stone not in PIECE_CODES:
+                    raise ValueError("Unbekannter Stein: " + stone)
+                board.play(col, PIECE_CODES[stone])
+                counts[PIECE_CODES[stone]] += 1
+        if counts[0] - counts[1] not in (0, 1):
+            raise ValueError("Ungültige Steinanzahl")
+    else:
+        for m in text:
+            if m < '1' or m > str(COLS):
+                raise ValueError("Ungültige Spalte: " + m)
+            col = int(m) - 1
+            if not board.can_play(col):
+                raise ValueError("Spalte " + m + " ist voll")
+            if is_terminal_node(board):
+                raise ValueError("Zug nach Spielende")
+            board.play(col, board.moves % 2)
+    return board
+
+
+def _init_worker(tt_size):
+    """
+    Legt die Transpositionstabelle eines Workers an.
+    """
+    global _tt
+    _tt = TranspositionTable(tt_size)
+
+
+def analyse_position(text, depth=DEPTH, time_ms=None):
+    """
+    Bewertet eine Stellung (läuft im Worker).
+
+    Parameter:
+        text: Eingabezeile ohne Kommentar
+        depth: Suchtiefe bzw. maximale Tiefe bei Zeitbudget
+        time_ms: Optionales Zeitbudget; dann iterative Vertiefung
+
+    Rückgabe:
+        Ergebnis als Dictionary (ohne Zeilennummer).
+    """
+    result = {'input': text}
+    try:
+        board = parse_position(text)
+    except ValueError as e:
+        result['error'] = str(e)
+        return result
+    maximizing = board.moves % 2 == 1  # KI ist der zweite Spieler
+    result['to_move'] = 'ai' if maximizing else 'player'
+    if is_terminal_node(board):
+        result['error'] = "Spiel ist beendet"
+        return result
+
+    # Jede Stellung mit leerer Tabelle: Ergebnis unabhängig von der Verteilung
+    _tt.clear()
+    ordering = MoveOrdering()
+    start = time.perf_counter()
+    if time_ms is None:
+        col, value = minimax(board, depth, -float('inf'), float('inf'), maximizing,
+                             _tt, None, None, ordering)
+        reached = depth
+    else:
+        col, value, reached = iterative_deepening(board, time_ms, _tt, depth, ordering,
+                                                  maximizingPlayer=maximizing)
+    result['col'] = col + 1
+    result['value'] = value
+    result['depth'] = reached
+    result['ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def read_positions(lines):
+    """
+    Liefert (Zeilennummer, Stellung) für alle Zeilen mit Inhalt.
+    """
+    for number, line in enumerate(lines, 1):
+        text = line.split('#', 1)[0].strip()
+        if text:
+            yield number, text
+
+
+def analyse_stream(lines, out, depth=DEPTH, time_ms=None, workers=None,
+                   inflight=None, tt_size=TT_SIZE * 16):
+    """
+    Bewertet alle Stellungen eines Zeilenstroms und schreibt die Ergebnisse
+    als JSON-Zeilen in der Reihenfolge der Eingabe.
+
+    Parameter:
+        lines: Iterierbare Eingabezeilen (wird nur schrittweise gelesen)
+        out: Ausgabestrom
+        depth: Suchtiefe bzw. maximale Tiefe bei Zeitbudget
+        time_ms: Optionales Zeitbudget je Stellung
+        workers: Anzahl der Prozesse (Standard: Anzahl der CPUs)
+        inflight: Maximale Anzahl gleichzeitig offener Aufträge
+        tt_size: Größe der Transpositionstabelle je Worker
+
+    Rückgabe:
+        Anzahl der geschriebenen Ergebnisse.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    inflight = inflight or workers * INFLIGHT_PER_WORKER
+    pending = collections.deque()
+    written = 0
+
+    def write_oldest():
+        number, job = pending.popleft()
+        result = job.get()
+        result['line'] = number
+        out.write(json.dumps(result, sort_keys=True) + "\n")
+
+    pool = multiprocessing.Pool(workers, _init_worker, (tt_size,))
+    try:
+        for number, text in read_positions(lines):
+            if len(pending) >= inflight:
+                write_oldest()
+                written += 1
+            pending.append((number, pool.apply_async(analyse_position, (text, depth, time_ms))))
+        while pending:
+            write_oldest()
+            written += 1
+    finally:
+        pool.terminate()
+        pool.join()
+    return written
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stapelanalyse von Vier-gewinnt-Stellungen.')
+    parser.add_argument('input', help="Eingabedatei ('-' für stdin)")
+    parser.add_argument('--out', default='-', help="Ausgabedatei ('-' für stdout)")
+    parser.add_argument('--depth', type=int, default=DEPTH,
+                        help='Suchtiefe (mit --time-ms: maximale Tiefe)')
+    parser.add_argument('--time-ms', type=int, help='Zeitbudget je Stellung (iterative Vertiefung)')
+    parser.add_argument('--workers', type=int, help='Anzahl der Prozesse')
+    parser.add_argument('--inflight', type=int, help='Maximal gleichzeitig offene Stellungen')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = sys.stdout if args.out == '-' else open(args.out, 'w')
+    try:
+        count = analyse_stream(source, target, args.depth, args.time_ms, args.workers, args.inflight)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(str(count) + " Stellungen analysiert", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Benchmark für Suche, Bewertung und Gewinnprüfung (nur auf dem Host).
+
+Misst auf einem festen Satz von Teststellungen:
+    - Knoten pro Sekunde (SearchStats) und Zeit bis Tiefe N der Minimax-Suche
+      (iterative Vertiefung über die angegebenen Tiefen)
+    - Übereinstimmung des gewählten Zuges mit dem Referenzzug
+    - Kosten pro Aufruf von score_position und winning_move
+    - Zeichenzeit des Plotters (Spielfeld und alle 42 Steine) im simulierten
+      EV3 (sim_ev3.py) mit DEFAULT_PROFILE und SEQUENTIAL_PROFILE; die
+      Zeiten laufen auf der virtuellen Uhr und hängen nicht vom Rechner ab
+
+Die Ergebnisse werden als JSON geschrieben und können mit einer
+gespeicherten Basislinie verglichen werden; Verschlechterungen über der
+Toleranz führen zum Exit-Code 1.
+
+Aufruf:
+    python bench.py --out bench.json
+    python bench.py --out neu.json --baseline bench.json --tolerance 0.15
+"""
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+import sim_ev3
+from board_setup import calibrate_board, draw_board
+from motion import DEFAULT_PROFILE, SEQUENTIAL_PROFILE
+from game_logic import (create_board, board_to_grid, minimax, score_position, winning_move, draw_piece,
+                        ROWS, COLS, PLAYER, AI)
+from transposition import TranspositionTable
+from ordering import MoveOrdering
+from stats import SearchStats
+from solver import solve, SOLVER_TT_SIZE, SIZE
+
+# Teststellungen: (Name, Kategorie, Züge als Spaltennummern 1..7)
+CORPUS = (
+    ('leer', 'opening', ''),
+    ('mitte', 'opening', '4'),
+    ('mitte-mitte', 'opening', '44'),
+    ('eroeffnung-4', 'opening', '4453'),
+    ('mittel-1', 'midgame', '7456144562541352'),
+    ('mittel-2', 'midgame', '54471554353443355'),
+    ('mittel-3', 'midgame', '3444267433232262433'),
+    ('end-1', 'endgame', '1421456314133211724632233465'),
+    ('end-2', 'endgame', '1237466554742334436667277122'),
+    ('end-3', 'endgame', '1114446441331333265666627324'),
+    ('sieg-1', 'forced-win', '544715543534433552'),
+    ('sieg-2', 'forced-win', '2353152345542232131'),
+    ('sieg-3', 'forced-win', '142477443733277113443312512'),
+    ('verlust-1', 'forced-loss', '5447155435344335522'),
+    ('verlust-2', 'forced-loss', '142455714224451551214667'),
+    ('verlust-3', 'forced-loss', '14346346242332634316224277'),
+)
+
+DEPTHS = (2, 4, 6)  # Standard-Suchtiefen
+EVAL_REPEAT = 2000  # Wiederholungen für die Messung der Einzelaufrufe
+SOLVE_EMPTY = 26  # Referenz per Löser, wenn höchstens so viele Felder frei sind
+TOLERANCE = 0.10  # Erlaubte relative Verschlechterung gegenüber der Basislinie
+PLOTTER_PROFILES = (('default', DEFAULT_PROFILE), ('sequential', SEQUENTIAL_PROFILE))
+# Feste Steinfolge für die Zeichenzeit: Spalten von links nach rechts auffüllen,
+# Spieler und KI abwechselnd
+PLOTTER_PIECES = tuple((row, col, PLAYER if (col * ROWS + row) % 2 == 0 else AI)
+                       for col in range(COLS) for row in range(ROWS))
+
+
+def position_from_moves(moves):
+    """
+    Baut eine Stellung aus einer Zugfolge (Spalten 1..7, Spieler beginnt).
+    """
+    board = create_board()
+    for m in moves:
+        board.play(int(m) - 1, board.moves % 2)
+    return board
+
+
+def reference_moves(board):
+    """
+    Ermittelt die Menge der optimalen Züge per Löser.
+
+    Rückgabe:
+        Liste der Spalten mit optimalem Ergebnis oder None, wenn die
+        Stellung für den Löser zu viele freie Felder hat.
+    """
+    if SIZE - board.moves > SOLVE_EMPTY:
+        return None
+    player = board.moves % 2
+    tt = TranspositionTable(SOLVER_TT_SIZE)
+    best = None
+    scores = {}
+    for col in range(7):
+        if not board.can_play(col):
+            continue
+        child = board.copy()
+        child.play(col, player)
+        if child.is_win(player):
+            score = (SIZE + 2 - child.moves) // 2
+        elif child.is_full():
+            score = 0
+        else:
+            score = -solve(child, 1 - player, tt)[1]
+        scores[col] = score
+        # Nur Ergebnisklasse vergleichen (Sieg/Remis/Niederlage)
+        outcome = (score > 0) - (score < 0)
+        if best is None or outcome > best:
+            best = outcome
+    return [c for c in scores if (scores[c] > 0) - (scores[c] < 0) == best]
+
+
+def bench_search(depths):
+    """
+    Misst die Minimax-Suche für alle Teststellungen.
+    """
+    results = {}
+    for name, category, moves in CORPUS:
+        board = position_from_moves(moves)
+        maximizing = board.moves % 2 == 1  # KI ist der zweite Spieler
+        tt = TranspositionTable(1 << 16)
+        ordering = MoveOrdering()
+        reference = reference_moves(board)
+        entry = {'category': category, 'moves': moves, 'reference': reference, 'depths': {}}
+        cumulative = 0.0
+        for depth in depths:
+            if depth > SIZE - board.moves:
+                break
+            tt.new_search()
+            stats = SearchStats()
+            start = time.perf_counter()
+            col, value = minimax(board, depth, -float('inf'), float('inf'), maximizing,
+                                 tt, None, None, ordering, stats)
+            elapsed = time.perf_counter() - start
+            cumulative += elapsed
+            nodes = stats.nodes
+            entry['depths'][str(depth)] = {
+                'move': col,
+                'value': value,
+                'nodes': nodes,
+                'time_ms': elapsed * 1000,
+                'time_to_depth_ms': cumulative * 1000,
+                'nps': nodes / elapsed if elapsed > 0 else 0.0,
+                'stats': stats.as_dict(),
+            }
+        # Ohne Löser-Referenz gilt der Zug der größten Tiefe als Referenz
+        if reference is None and entry['depths']:
+            deepest = entry['depths'][str(max(int(d) for d in entry['depths']))]
+            reference = [deepest['move']]
+            entry['reference'] = reference
+        for data in entry['depths'].values():
+            data['agree'] = data['move'] in reference
+        results[name] = entry
+    return results
+
+
+def _per_call_us(function, args_list, repeat):
+    """
+    Mittlere Dauer eines Aufrufs in Mikrosekunden.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            function(*args)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1e6 / (repeat * len(args_list))
+
+
+def bench_eval(repeat):
+    """
+    Misst die Kosten von score_position und winning_move pro Aufruf.
+    """
+    boards = [position_from_moves(moves) for _, _, moves in CORPUS]
+    grids = [board_to_grid(b) for b in boards]
+    return {
+        'score_position_us': _per_call_us(score_position, [(b, AI) for b in boards], repeat),
+        'score_position_grid_us': _per_call_us(score_position, [(g, AI) for g in grids],
+                                               max(1, repeat // 20)),
+        'winning_move_us': _per_call_us(winning_move, [(b, PLAYER) for b in boards], repeat),
+    }
+
+
+def bench_plotter():
+    """
+    Misst die Zeichenzeiten im simulierten EV3 je Bewegungsprofil (in ms).
+    """
+    results = {}
+    for name, profile in PLOTTER_PROFILES:
+        sim_ev3.WORLD.reset(realtime=False)  # Nur Motorzeiten, unabhängig vom Rechner
+        motor_a = sim_ev3.Motor(sim_ev3.Port.A)
+        motor_b = sim_ev3.Motor(sim_ev3.Port.B)
+        motor_c = sim_ev3.Motor(sim_ev3.Port.C)
+        with contextlib.redirect_stdout(io.StringIO()):  # Zeitausgaben der Zeichenfunktionen
+            max_height, min_height, field_width = calibrate_board(
+                motor_b, motor_c, sim_ev3.ColorSensor(sim_ev3.Port.S3),
+                sim_ev3.TouchSensor(sim_ev3.Port.S4))
+            board_ms = draw_board(motor_a, motor_b, motor_c, max_height, min_height, field_width,
+                                  profile)
+            pieces_ms = sum(draw_piece(motor_a, motor_b, motor_c, row, col, piece,
+                                       max_height, min_height, field_width, profile)
+                            for row, col, piece in PLOTTER_PIECES)
+        results[name] = {'board_ms': board_ms, 'pieces_ms': pieces_ms,
+                         'total_ms': board_ms + pieces_ms}
+    return results
+
+
+def summarize(search):
+    """
+    Fasst die Suchergebnisse je Tiefe zusammen.
+    """
+    summary = {'nps': {}, 'time_to_depth_ms': {}, 'agreement': {}}
+    depths = set()
+    for entry in search.values():
+        depths.update(entry['depths'])
+    for depth in sorted(depths, key=int):
+        rows = [e['depths'][depth] for e in search.values() if depth in e['depths']]
+        nodes = sum(r['nodes'] for r in rows)
+        seconds = sum(r['time_ms'] for r in rows) / 1000
+        summary['nps'][depth] = nodes / seconds if seconds > 0 else 0.0
+        summary['time_to_depth_ms'][depth] = sum(r['time_to_depth_ms'] for r in rows)
+        summary['agreement'][depth] = sum(1 for r in rows if r['agree']) / len(rows)
+    return summary
+
+
+def compare(current, baseline, tolerance=TOLERANCE):
+    """
+    Vergleicht zwei Benchmark-Ergebnisse.
+
+    Rückgabe:
+        Liste der Verschlechterungen als Textzeilen.
+    """
+    regressions = []
+
+    def check(label, new, old, higher_is_better):
+        if old is None or new is None or old == 0:
+            return
+        change = (new - old) / old
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append('%s: %.4g -> %.4g (%+.1f%%)' % (label, old, new, change * 100))
+
+    for depth, value in current['summary']['nps'].items():
+        check('nps@' + depth, value, baseline['summary']['nps'].get(depth), True)
+    for depth, value in current['summary']['time_to_depth_ms'].items():
+        check('time_to_depth@' + depth, value,
+              baseline['summary']['time_to_depth_ms'].get(depth), False)
+    for depth, value in current['summary']['agreement'].items():
+        old = baseline['summary']['agreement'].get(depth)
+        if old is not None and value < old:
+            regressions.append('agreement@%s: %.2f -> %.2f' % (depth, old, value))
+    for key, value in current['eval'].items():
+        check(key, value, baseline['eval'].get(key), False)
+    for name, times in current['plotter'].items():
+        old = baseline.get('plotter', {}).get(name, {})  # Ältere Basislinien ohne Plotter
+        for key, value in times.items():
+            check('plotter.' + name + '.' + key, value, old.get(key), False)
+    return regressions
+
+
+def run(depths=DEPTHS, repeat=EVAL_REPEAT):
+    """
+    Führt alle Messungen aus.
+
+    Rückgabe:
+        Ergebnis als Dictionary (JSON-serialisierbar).
+    """
+    search = bench_search(depths)
+    return {
+        'meta': {
+            'python': platform.python_implementation() + ' ' + platform.python_version(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'depths': list(depths),
+        },
+        'summary': summarize(search),
+        'eval': bench_eval(repeat),
+        'plotter': bench_plotter(),
+        'search': search,
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark der Vier-gewinnt-KI.')
+    parser.add_argument('--depths', type=int, nargs='+', default=list(DEPTHS), help='Suchtiefen')
+    parser.add_argument('--repeat', type=int, default=EVAL_REPEAT,
+                        help='Wiederholungen für Einzelaufrufe')
+    parser.add_argument('--out', default='bench.json', help='Ausgabedatei (JSON)')
+    parser.add_argument('--baseline', help='Basislinie zum Vergleich (JSON)')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='Erlaubte relative Verschlechterung')
+    args = parser.parse_args(argv)
+
+    result = run(args.depths, args.repeat)
+    with open(args.out, 'w') as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+    for depth in sorted(result['summary']['nps'], key=int):
+        print('Tiefe %s: %8.0f Knoten/s, %8.1f ms bis Tiefe, Übereinstimmung %3.0f%%' % (
+            depth, result['summary']['nps'][depth], result['summary']['time_to_depth_ms'][depth],
+            result['summary']['agreement'][depth] * 100))
+    for key in sorted(result['eval']):
+        print('%s: %.2f' % (key, result['eval'][key]))
+    for name, times in sorted(result['plotter'].items()):
+        print('Plotter %s: Spielfeld %.1f s, %d Steine %.1f s' % (
+            name, times['board_ms'] / 1000, len(PLOTTER_PIECES), times['pieces_ms'] / 1000))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        for line in regressions:
+            print('VERSCHLECHTERUNG ' + line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
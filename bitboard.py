@@ -0,0 +1,227 @@
+"""
+Bitboard-Darstellung des Spielfelds für die KI-Suche.
+
+Jede Spalte belegt ROWS + 1 Bits (das oberste Bit ist ein leeres
+Sentinel-Bit, damit Verschiebungen nicht in die Nachbarspalte überlaufen).
+Bit-Index einer Zelle: col * (ROWS + 1) + row, Zeile 0 ist unten.
+
+Eine Position besteht aus zwei Bitmasken (eine je Spieler) und einem
+Höhen-Array, das für jede Spalte die Anzahl der Steine speichert.
+"""
+
+# Spielfeld-Konstanten
+ROWS = 6  # Anzahl der Zeilen
+COLS = 7  # Anzahl der Spalten
+H1 = ROWS + 1  # Bits pro Spalte (inkl. Sentinel-Bit)
+
+# Unterste Zelle jeder Spalte
+BOTTOM_MASK = 0
+for _c in range(COLS):
+    BOTTOM_MASK |= 1 << (_c * H1)
+
+# Alle spielbaren Zellen (ohne Sentinel-Bits)
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+# Zobrist-Schlüssel sind 30 Bit breit, damit sie unter MicroPython als
+# Small-Int ohne Heap-Allokation verarbeitet werden.
+ZOBRIST_BITS = 30
+ZOBRIST_MASK = (1 << ZOBRIST_BITS) - 1
+
+
+def _zobrist_table(seed):
+    """
+    Erzeugt reproduzierbare Zufallsschlüssel (Xorshift32) für alle Bit-Indizes.
+    """
+    table = []
+    x = seed
+    for _ in range(COLS * H1):
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFFFFFF
+        table.append(x & ZOBRIST_MASK)
+    return table
+
+
+# Ein Schlüssel je Spieler und Zelle
+ZOBRIST = (_zobrist_table(0x9E3779B9), _zobrist_table(0x7F4A7C15))
+
+
+def cell_bit(row, col):
+    """
+    Gibt das Bit der Zelle (row, col) zurück.
+    """
+    return 1 << (col * H1 + row)
+
+
+def column_mask(col):
+    """
+    Gibt die Bitmaske aller spielbaren Zellen der Spalte col zurück.
+    """
+    return ((1 << ROWS) - 1) << (col * H1)
+
+
+def has_four(m):
+    """
+    Prüft per Bit-Verschiebung, ob eine Maske vier Steine in einer Reihe enthält.
+
+    Parameter:
+        m: Bitmaske der Steine eines Spielers
+
+    Rückgabe:
+        True, wenn vier verbundene Steine existieren, sonst False.
+    """
+    # Vertikal
+    x = m & (m >> 1)
+    if x & (x >> 2):
+        return True
+    # Horizontal
+    x = m & (m >> H1)
+    if x & (x >> (2 * H1)):
+        return True
+    # Diagonal (abfallend)
+    x = m & (m >> (H1 - 1))
+    if x & (x >> (2 * (H1 - 1))):
+        return True
+    # Diagonal (ansteigend)
+    x = m & (m >> (H1 + 1))
+    if x & (x >> (2 * (H1 + 1))):
+        return True
+    return False
+
+
+def winning_cells(own, mask):
+    """
+    Ermittelt alle freien Zellen, die für einen Spieler vier in einer Reihe
+    vervollständigen würden (unabhängig davon, ob sie schon bespielbar sind).
+
+    Parameter:
+        own: Bitmaske der Steine des Spielers
+        mask: Bitmaske aller belegten Zellen
+
+    Rückgabe:
+        Bitmaske der Gewinnzellen.
+    """
+    # Vertikal (nur nach oben möglich)
+    r = (own << 1) & (own << 2) & (own << 3)
+
+    # Horizontal und beide Diagonalen
+    for shift in (H1, H1 - 1, H1 + 1):
+        p = (own << shift) & (own << (2 * shift))
+        r |= p & (own << (3 * shift))
+        r |= p & (own >> shift)
+        p = (own >> shift) & (own >> (2 * shift))
+        r |= p & (own << shift)
+        r |= p & (own >> (3 * shift))
+
+    return r & (BOARD_MASK ^ mask)
+
+
+class Position:
+    """
+    Spielposition als Bitboard.
+
+    Attribute:
+        masks: Liste mit zwei Bitmasken, eine je Spieler (Index 0 oder 1)
+        heights: Anzahl der Steine je Spalte
+        moves: Anzahl der gespielten Steine
+        hash: Inkrementeller Zobrist-Hash der Position
+    """
+
+    def __init__(self):
+        self.masks = [0, 0]
+        self.heights = [0] * COLS
+        self.moves = 0
+        self.hash = 0
+
+    def copy(self):
+        """
+        Erstellt eine unabhängige Kopie der Position.
+        """
+        other = Position()
+        other.masks[0] = self.masks[0]
+        other.masks[1] = self.masks[1]
+        other.heights = self.heights[:]
+        other.moves = self.moves
+        other.hash = self.hash
+        return other
+
+    def mask(self):
+        """
+        Gibt die Bitmaske aller belegten Zellen zurück.
+        """
+        return self.masks[0] | self.masks[1]
+
+    def can_play(self, col):
+        """
+        True, wenn die Spalte col noch nicht voll ist.
+        """
+        return self.heights[col] < ROWS
+
+    def valid_mask(self):
+        """
+        Gibt die Bitmaske der Zellen zurück, in die als nächstes gespielt
+        werden kann (je Spalte höchstens ein Bit).
+        """
+        return (self.mask() + BOTTOM_MASK) & BOARD_MASK
+
+    def play(self, col, player):
+        """
+        Setzt einen Stein des Spielers player in die Spalte col.
+
+        Rückgabe:
+            Die Zeile, in der der Stein gelandet ist.
+        """
+        row = self.heights[col]
+        index = col * H1 + row
+        self.masks[player] |= 1 << index
+        self.hash ^= ZOBRIST[player][index]
+        self.heights[col] = row + 1
+        self.moves += 1
+        return row
+
+    def undo(self, col, player):
+        """
+        Nimmt den obersten Stein des Spielers player aus der Spalte col zurück.
+        """
+        row = self.heights[col] - 1
+        index = col * H1 + row
+        self.masks[player] ^= 1 << index
+        self.hash ^= ZOBRIST[player][index]
+        self.heights[col] = row
+        self.moves -= 1
+
+    def is_win(self, player):
+        """
+        True, wenn der Spieler player vier Steine in einer Reihe hat.
+        """
+        return has_four(self.masks[player])
+
+    def wins_at(self, row, col, player):
+        """
+        True, wenn ein Stein des Spielers player in der freien Zelle
+        (row, col) vier in einer Reihe vervollständigen würde.
+        """
+        return bool(winning_cells(self.masks[player], self.mask()) & cell_bit(row, col))
+
+    def is_full(self):
+        """
+        True, wenn alle Zellen belegt sind.
+        """
+        return self.moves == ROWS * COLS
+
+    def cell(self, row, col):
+        """
+        Gibt den Spielerindex in Zelle (row, col) zurück oder None, wenn leer.
+        """
+        bit = 1 << (col * H1 + row)
+        if self.masks[0] & bit:
+            return 0
+        if self.masks[1] & bit:
+            return 1
+        return None
+
+    def key(self):
+        """
+        Eindeutiger Schlüssel der Position (unabhängig von der Zugfolge).
+        """
+        return self.masks[0] + self.mask() + BOTTOM_MASK
@@ -1,9 +1,22 @@
-from pybricks.parameters import Color
+import json
+
+from hardware import Color, StopWatch
+from motion import DEFAULT_PROFILE, apply_profile, move_xy, pen_down, pen_up
 
 # Spielfeld-Konstanten
 ROWS = 6  # Anzahl der Zeilen im Spielfeld
 COLS = 7  # Anzahl der Spalten im Spielfeld
 
+# Kalibrierungsspeicher
+CALIBRATION_PATH = 'calibration.json'  # Datei mit den Ergebnissen der letzten Kalibrierung
+VERIFY_MARGIN = 30  # Erlaubte Abweichung der Sensoren bei der Schnellprüfung (Grad)
+EDGE_OFFSET = 200  # Abstand des X-Nullpunkts von der Kante der roten Fläche (Grad)
+
+# Startmodi
+START_FULL = 'full'  # Vollständig kalibrieren und Spielfeld zeichnen
+START_FAST = 'fast'  # Gespeicherte Kalibrierung prüfen und wiederverwenden, Spielfeld zeichnen
+START_SHEET = 'sheet'  # Wie START_FAST, aber auf dem vorhandenen Blatt weiterspielen
+
 def calibrate_board(motor_b, motor_c, light_sensor, touch_sensor):
     """
     Kalibriert die Motoren für das Zeichnen des Spielfelds.
@@ -32,13 +45,137 @@ def calibrate_board(motor_b, motor_c, light_sensor, touch_sensor):
     while light_sensor.color() == Color.RED:
         motor_b.run(600)  # Motor läuft, bis der Lichtsensor keine rote Farbe mehr erkennt
     motor_b.stop()  # Motor stoppen
-    motor_b.run_angle(600, -200)  # Ein wenig zurückfahren
+    motor_b.run_angle(600, -EDGE_OFFSET)  # Ein wenig zurückfahren
     motor_b.reset_angle(0)  # Winkel auf 0 zurücksetzen (Referenzposition)
     field_width = 720  # Breite des Spielfelds (fest definiert)
 
     return max_height, min_height, field_width
 
-def draw_board(motor_a, motor_b, motor_c, max_height, min_height, field_width):
+def save_calibration(max_height, min_height, field_width, motors=None, path=CALIBRATION_PATH):
+    """
+    Speichert die Kalibrierung in einer JSON-Datei.
+    
+    Parameter:
+        max_height, min_height, field_width: Ergebnis von calibrate_board
+        motors: Optionales Tuple (motor_a, motor_b, motor_c); deren aktuelle
+                Winkel werden als Parkposition gespeichert. Ohne Motoren gilt
+                die Parkposition als unbekannt (z. B. während eines Spiels).
+        path: Pfad der Datei
+    """
+    data = {
+        'max_height': max_height,
+        'min_height': min_height,
+        'field_width': field_width,
+        'park': None,
+    }
+    if motors is not None:
+        data['park'] = [motor.angle() for motor in motors]
+    try:
+        with open(path, 'w') as f:
+            f.write(json.dumps(data))
+    except OSError:
+        print("Kalibrierung konnte nicht gespeichert werden")
+
+def load_calibration(path=CALIBRATION_PATH):
+    """
+    Liest eine gespeicherte Kalibrierung.
+    
+    Rückgabe:
+        Dictionary mit max_height, min_height, field_width und park oder
+        None, wenn keine gültige Datei vorhanden ist.
+    """
+    try:
+        with open(path) as f:
+            data = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    for key in ('max_height', 'min_height', 'field_width', 'park'):
+        if key not in data:
+            return None
+    return data
+
+def verify_calibration(motor_a, motor_b, motor_c, light_sensor, touch_sensor, data):
+    """
+    Übernimmt die gespeicherte Parkposition und prüft sie mit einer kurzen
+    Anfahrt an beide Sensoren. Der Lichtsensor muss innerhalb von
+    VERIFY_MARGIN Grad um EDGE_OFFSET die Kante der roten Fläche erkennen,
+    und der Berührungssensor muss innerhalb von VERIFY_MARGIN Grad um den
+    Nullpunkt der Y-Achse auslösen. Beide Nullpunkte werden dabei
+    nachgeführt.
+    
+    Parameter:
+        motor_a, motor_b, motor_c: Motoren des Plotters
+        light_sensor: Lichtsensor zur Erkennung der Kante
+        touch_sensor: Berührungssensor zur Erkennung der oberen Position
+        data: Ergebnis von load_calibration
+        
+    Rückgabe:
+        True, wenn die Kalibrierung weiterverwendet werden kann.
+    """
+    park = data['park']
+    if park is None:
+        return False  # Letzter Lauf wurde nicht sauber beendet
+    motor_a.reset_angle(park[0])
+    motor_b.reset_angle(park[1])
+    motor_c.reset_angle(park[2])
+
+    move_xy(motor_b, motor_c, 0, -VERIFY_MARGIN, DEFAULT_PROFILE.travel_speed, DEFAULT_PROFILE)
+    if light_sensor.color() != Color.RED or touch_sensor.pressed():
+        return False
+    motor_b.run(600)  # Wie bei der Kalibrierung bis zur Kante fahren
+    while light_sensor.color() == Color.RED:
+        if motor_b.angle() > EDGE_OFFSET + VERIFY_MARGIN:
+            motor_b.stop()
+            return False
+    motor_b.stop()
+    if motor_b.angle() < EDGE_OFFSET - VERIFY_MARGIN:
+        return False
+    motor_b.run_angle(600, -EDGE_OFFSET)
+    motor_b.reset_angle(0)  # Referenzposition nachführen
+    motor_c.run(100)  # Langsam nach oben bis zum Sensor
+    while not touch_sensor.pressed():
+        if motor_c.angle() > VERIFY_MARGIN:
+            motor_c.stop()
+            return False
+    motor_c.stop()
+    motor_c.reset_angle(0)  # Referenzposition nachführen
+    motor_c.run_target(DEFAULT_PROFILE.travel_speed, data['max_height'])
+    return True
+
+def prepare_board(motor_a, motor_b, motor_c, light_sensor, touch_sensor, mode=START_FULL,
+                  profile=DEFAULT_PROFILE, path=CALIBRATION_PATH):
+    """
+    Kalibriert den Plotter und zeichnet bei Bedarf das Spielfeld.
+    
+    Parameter:
+        motor_a, motor_b, motor_c: Motoren des Plotters
+        light_sensor: Lichtsensor zur Erkennung der Kante
+        touch_sensor: Berührungssensor zur Erkennung der oberen Position
+        mode: START_FULL, START_FAST oder START_SHEET; schlägt die
+              Schnellprüfung fehl, wird vollständig kalibriert
+        profile: Bewegungsprofil (siehe motion.py)
+        path: Pfad der Kalibrierungsdatei
+        
+    Rückgabe:
+        max_height, min_height, field_width
+    """
+    data = None
+    if mode != START_FULL:
+        data = load_calibration(path)
+    if data is not None and verify_calibration(motor_a, motor_b, motor_c, light_sensor,
+                                               touch_sensor, data):
+        max_height, min_height, field_width = data['max_height'], data['min_height'], data['field_width']
+        print("Gespeicherte Kalibrierung verwendet")
+    else:
+        max_height, min_height, field_width = calibrate_board(motor_b, motor_c, light_sensor, touch_sensor)
+    # Parkposition bis zum sauberen Programmende als unbekannt markieren
+    save_calibration(max_height, min_height, field_width, None, path)
+    if mode != START_SHEET:
+        draw_board(motor_a, motor_b, motor_c, max_height, min_height, field_width, profile)
+    return max_height, min_height, field_width
+
+def draw_board(motor_a, motor_b, motor_c, max_height, min_height, field_width,
+               profile=DEFAULT_PROFILE):
     """
     Zeichnet das Spielfeld mit vertikalen und horizontalen Linien.
     
@@ -49,29 +186,47 @@ def draw_board(motor_a, motor_b, motor_c, max_height, min_height, field_width):
         max_height: Maximale Höhe (oberer Rand)
         min_height: Minimale Höhe (unterer Rand)
         field_width: Breite des Spielfelds
+        profile: Bewegungsprofil (siehe motion.py)
+        
+    Rückgabe:
+        Die Zeichenzeit in Millisekunden.
     """
+    watch = StopWatch()  # Zeichenzeit messen
+    apply_profile(profile, motor_a, motor_b, motor_c)
     field_height = max_height - min_height  # Berechnung der Spielfeldhöhe
+    y = max_height  # Aktuelle Y-Position des Stifts
 
     # Zeichnen der vertikalen Linien
     for i in range(COLS + 1):
         x = i * (field_width / COLS)  # Position der vertikalen Linie berechnen
-        motor_b.run_target(600, -x)  # Motor zur X-Position bewegen
-        motor_c.run_target(600, max_height)  # Motor zur oberen Position bewegen
-        motor_a.run_angle(600, -180)  # Stift absenken
-        motor_c.run_target(600, min_height)  # Vertikale Linie nach unten zeichnen
-        motor_a.run_angle(600, 180)  # Stift anheben
-
-    # Zeichnen der horizontalen Linien
-    motor_b.run_target(600, 0)  # Zurück zur linken Seite
-    for i in range(ROWS + 1):
+        if profile.serpentine and y == min_height:
+            start, end = min_height, max_height  # Von unten nach oben zeichnen
+        else:
+            start, end = max_height, min_height  # Von oben nach unten zeichnen
+        move_xy(motor_b, motor_c, -x, start, profile.travel_speed, profile)  # Zum Linienanfang fahren
+        pen_down(motor_a, profile)  # Stift absenken
+        motor_c.run_target(profile.line_speed, end)  # Vertikale Linie zeichnen
+        pen_up(motor_a, profile)  # Stift anheben
+        y = end
+
+    # Zeichnen der horizontalen Linien (beginnend an der Seite, an der der Stift steht)
+    x = -field_width if profile.serpentine else 0
+    rows = range(ROWS + 1)
+    if profile.serpentine and y == min_height:
+        rows = range(ROWS, -1, -1)  # Von unten nach oben
+    for i in rows:
         y = max_height - i * (field_height / ROWS)  # Position der horizontalen Linie berechnen
-        motor_c.run_target(600, y)  # Motor zur Y-Position bewegen
-        motor_b.run_target(600, 0)  # Links starten
-        motor_a.run_angle(600, -180)  # Stift absenken
-        motor_b.run_target(600, -field_width)  # Horizontale Linie nach rechts zeichnen
-        motor_a.run_angle(600, 180)  # Stift anheben
+        if not profile.serpentine:
+            x = 0  # Jede Linie links beginnen
+        end = 0 if x != 0 else -field_width
+        move_xy(motor_b, motor_c, x, y, profile.travel_speed, profile)  # Zum Linienanfang fahren
+        pen_down(motor_a, profile)  # Stift absenken
+        motor_b.run_target(profile.line_speed, end)  # Horizontale Linie zeichnen
+        pen_up(motor_a, profile)  # Stift anheben
+        x = end
 
     # Zurück zur Startposition
-    motor_a.run_angle(600, 180)  # Sicherstellen, dass der Stift angehoben ist
-    motor_b.run_target(600, 0)  # X-Achse zur Startposition
-    motor_c.run_target(600, max_height)  # Y-Achse zur Startposition
\ No newline at end of file
+    move_xy(motor_b, motor_c, 0, max_height, profile.travel_speed, profile)
+    elapsed = watch.time()
+    print("Zeichenzeit Spielfeld: " + str(elapsed) + " ms")
+    return elapsed
@@ -0,0 +1,210 @@
+"""
+Eröffnungsbuch in einer kompakten, sortierten Binärdatei.
+
+Jeder Eintrag ist 8 Byte groß (Big Endian): die oberen 7 Byte enthalten
+den Positionsschlüssel (Position.key), das unterste Byte die beste Spalte.
+Gespiegelte Stellungen werden zusammengefasst, gespeichert wird jeweils
+die Variante mit dem kleineren Schlüssel.
+
+Die Abfrage sucht binär direkt in der Datei (ein Lesezugriff von 8 Byte
+pro Schritt), das Buch muss also nie vollständig in den Speicher des EV3
+passen.
+
+Erzeugen (auf dem Host):
+    python book.py --plies 8 --depth 8 --out opening_book.bin
+"""
+import struct
+
+from bitboard import COLS, H1, BOTTOM_MASK
+
+BOOK_PATH = 'opening_book.bin'  # Standardpfad des Eröffnungsbuchs
+RECORD_SIZE = 8  # Bytes pro Eintrag
+
+_COLUMN_BITS = (1 << H1) - 1
+
+
+def mirror_mask(m):
+    """
+    Spiegelt eine Bitmaske an der Mittelspalte.
+    """
+    result = 0
+    for c in range(COLS):
+        result |= ((m >> (c * H1)) & _COLUMN_BITS) << ((COLS - 1 - c) * H1)
+    return result
+
+
+def book_key(board):
+    """
+    Gibt den Buchschlüssel einer Position zurück.
+
+    Rückgabe:
+        Tuple (Schlüssel, gespiegelt): gespiegelt ist True, wenn der
+        Schlüssel zur gespiegelten Stellung gehört.
+    """
+    key = board.key()
+    mirrored = mirror_mask(board.masks[0]) + mirror_mask(board.mask()) + BOTTOM_MASK
+    if mirrored < key:
+        return mirrored, True
+    return key, False
+
+
+def pack_record(key, col):
+    """
+    Kodiert einen Eintrag als 8 Byte.
+    """
+    return struct.pack('>II', key >> 24, ((key & 0xFFFFFF) << 8) | col)
+
+
+def unpack_record(data):
+    """
+    Dekodiert einen 8-Byte-Eintrag.
+
+    Rückgabe:
+        Tuple (Schlüssel, Spalte).
+    """
+    hi, lo = struct.unpack('>II', data)
+    return (hi << 24) | (lo >> 8), lo & 0xFF
+
+
+class OpeningBook:
+    """
+    Lesezugriff auf ein Eröffnungsbuch per binärer Suche in der Datei.
+
+    Attribute:
+        count: Anzahl der Einträge
+        hits: Anzahl erfolgreicher Abfragen
+    """
+
+    def __init__(self, path=BOOK_PATH):
+        self.file = open(path, 'rb')
+        self.file.seek(0, 2)
+        self.count = self.file.tell() // RECORD_SIZE
+        self.hits = 0
+
+    @staticmethod
+    def open(path=BOOK_PATH):
+        """
+        Öffnet ein Eröffnungsbuch.
+
+        Rückgabe:
+            Das OpeningBook oder None, wenn die Datei nicht existiert.
+        """
+        try:
+            return OpeningBook(path)
+        except OSError:
+            return None
+
+    def close(self):
+        """
+        Schließt die Buchdatei.
+        """
+        self.file.close()
+
+    def _read(self, index):
+        """
+        Liest den Eintrag mit dem gegebenen Index.
+        """
+        self.file.seek(index * RECORD_SIZE)
+        return unpack_record(self.file.read(RECORD_SIZE))
+
+    def lookup(self, board):
+        """
+        Sucht den Buchzug für eine Position.
+
+        Parameter:
+            board: Das Spielfeld
+
+        Rückgabe:
+            Die Spalte oder None, wenn die Position nicht im Buch steht.
+        """
+        key, mirrored = book_key(board)
+        low = 0
+        high = self.count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            mid_key, col = self._read(mid)
+            if mid_key < key:
+                low = mid + 1
+            elif mid_key > key:
+                high = mid - 1
+            else:
+                if mirrored:
+                    col = COLS - 1 - col
+                if not board.can_play(col):
+                    return None
+                self.hits += 1
+                return col
+        return None
+
+
+def generate(path, plies, depth, player=1, progress=None):
+    """
+    Erzeugt ein Eröffnungsbuch (nur auf dem Host ausführen).
+
+    Es werden alle Stellungen bis zu `plies` Halbzügen durchlaufen, in denen
+    der Buch-Spieler am Zug ist. Für den Gegner werden alle Züge verfolgt,
+    für den Buch-Spieler nur der gefundene beste Zug.
+
+    Parameter:
+        path: Ausgabedatei
+        plies: Maximale Anzahl gespielter Steine einer Buchstellung
+        depth: Suchtiefe für die Bewertung einer Stellung
+        player: Spielerindex, für den das Buch erzeugt wird (1 = KI)
+        progress: Optionale Funktion, die mit der Anzahl der Einträge aufgerufen wird
+
+    Rückgabe:
+        Anzahl der geschriebenen Einträge.
+    """
+    from game_logic import minimax, create_board, PIECE_INDEX, AI
+    from transposition import TranspositionTable
+    from ordering import MoveOrdering
+
+    tt = TranspositionTable(1 << 20)
+    ordering = MoveOrdering()
+    entries = {}
+    board = create_board()
+
+    def visit():
+        if board.moves > plies:
+            return
+        if board.is_win(0) or board.is_win(1) or board.is_full():
+            return
+        to_move = board.moves % 2
+        if to_move == player:
+            key, mirrored = book_key(board)
+            if key in entries:
+                return
+            tt.new_search()
+            col, value = minimax(board, depth, -float('inf'), float('inf'),
+                                 player == PIECE_INDEX[AI], tt, None, None, ordering)
+            entries[key] = COLS - 1 - col if mirrored else col
+            if progress is not None:
+                progress(len(entries))
+            board.play(col, to_move)
+            visit()
+            board.undo(col, to_move)
+        else:
+            for col in range(COLS):
+                if board.can_play(col):
+                    board.play(col, to_move)
+                    visit()
+                    board.undo(col, to_move)
+
+    visit()
+
+    with open(path, 'wb') as f:
+        for key in sorted(entries):
+            f.write(pack_record(key, entries[key]))
+    return len(entries)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Erzeugt das Eröffnungsbuch.')
+    parser.add_argument('--plies', type=int, default=8, help='Maximale Anzahl Halbzüge')
+    parser.add_argument('--depth', type=int, default=8, help='Suchtiefe je Stellung')
+    parser.add_argument('--out', default=BOOK_PATH, help='Ausgabedatei')
+    args = parser.parse_args()
+    n = generate(args.out, args.plies, args.depth)
+    print(str(n) + " Einträge geschrieben: " + args.out)
@@ -0,0 +1,220 @@
+"""
+Tabellengesteuerte, inkrementelle Stellungsbewertung.
+
+Alle 69 Viererfenster des Spielfelds werden einmalig vorberechnet, ebenso
+für jede Zelle die Liste der Fenster, die sie enthält. Eine
+EvaluatedPosition führt je Fenster die Anzahl der Steine beider Spieler
+mit und aktualisiert beim Setzen und Zurücknehmen eines Steins nur die
+betroffenen Fenster, ohne dabei Objekte auf dem Heap anzulegen. Die
+Bewertung eines Blattes ist damit ein einfacher Zugriff statt eines
+vollständigen Durchlaufs über das Spielfeld.
+
+Die Gewichte entsprechen exakt game_logic.evaluate_window und
+game_logic.score_position (100/5/2/-4, Mittelspalte ×3).
+"""
+from bitboard import Position, ROWS, COLS, H1, ZOBRIST
+
+CENTER_COL = COLS // 2  # Mittlere Spalte
+CENTER_WEIGHT = 3  # Punkte je eigenem Stein in der Mittelspalte
+
+
+def _build_windows():
+    """
+    Erzeugt alle Viererfenster als Tupel von Bit-Indizes (col * H1 + row).
+    """
+    windows = []
+    # Horizontal
+    for r in range(ROWS):
+        for c in range(COLS - 3):
+            windows.append(tuple((c + i) * H1 + r for i in range(4)))
+    # Vertikal
+    for c in range(COLS):
+        for r in range(ROWS - 3):
+            windows.append(tuple(c * H1 + r + i for i in range(4)))
+    # Diagonal (ansteigend)
+    for r in range(ROWS - 3):
+        for c in range(COLS - 3):
+            windows.append(tuple((c + i) * H1 + r + i for i in range(4)))
+    # Diagonal (abfallend)
+    for r in range(ROWS - 3):
+        for c in range(COLS - 3):
+            windows.append(tuple((c + i) * H1 + r + 3 - i for i in range(4)))
+    return windows
+
+
+WINDOWS = _build_windows()
+N_WINDOWS = len(WINDOWS)  # 69
+
+# Fenster je Zelle (Index: Bit-Index der Zelle)
+CELL_WINDOWS = [[] for _ in range(COLS * H1)]
+for _w in range(N_WINDOWS):
+    for _index in WINDOWS[_w]:
+        CELL_WINDOWS[_index].append(_w)
+CELL_WINDOWS = [tuple(ws) for ws in CELL_WINDOWS]
+
+
+def _window_score(own, opp):
+    """
+    Bewertung eines Fensters mit own eigenen und opp gegnerischen Steinen
+    (gleiche Regeln wie game_logic.evaluate_window).
+    """
+    empty = 4 - own - opp
+    score = 0
+    if own == 4:
+        score += 100
+    elif own == 3 and empty == 1:
+        score += 5
+    elif own == 2 and empty == 2:
+        score += 2
+    if opp == 3 and empty == 1:
+        score -= 4
+    return score
+
+
+# WINDOW_SCORE[own * 5 + opp]
+WINDOW_SCORE = [0] * 25
+for _own in range(5):
+    for _opp in range(5 - _own):
+        WINDOW_SCORE[_own * 5 + _opp] = _window_score(_own, _opp)
+
+
+class EvaluatedPosition(Position):
+    """
+    Position mit laufender Stellungsbewertung für die Suche.
+
+    Setzen und Zurücknehmen eines Steins verändern nur Listen mit kleinen
+    Ganzzahlen; die Bitmasken (über 30 Bit, unter MicroPython also
+    Heap-Objekte) werden erst bei Bedarf aus den Zellen berechnet. Ein Sieg
+    wird über die Anzahl vollständiger Fenster erkannt. Damit legt ein
+    Suchknoten keine neuen Objekte an.
+
+    Attribute:
+        cells: Belegung je Bit-Index (0 leer, sonst Spielerindex + 1)
+        counts: Anzahl der Steine je Spieler und Fenster
+        fours: Anzahl der Fenster mit vier Steinen je Spieler
+        scores: Aktuelle Bewertung aus Sicht beider Spieler
+                (entspricht score_position für den jeweiligen Spieler)
+    """
+
+    def __init__(self):
+        self.cells = bytearray(COLS * H1)
+        self.heights = [0] * COLS
+        self.moves = 0
+        self.hash = 0
+        self.counts = [[0] * N_WINDOWS, [0] * N_WINDOWS]
+        self.fours = [0, 0]
+        self.scores = [0, 0]
+
+    @property
+    def masks(self):
+        """
+        Bitmasken beider Spieler (wird bei jedem Zugriff neu berechnet).
+        """
+        masks = [0, 0]
+        for index in range(COLS * H1):
+            if self.cells[index]:
+                masks[self.cells[index] - 1] |= 1 << index
+        return masks
+
+    def copy(self):
+        """
+        Erstellt eine unabhängige Kopie der Position samt Bewertung.
+        """
+        other = EvaluatedPosition()
+        other.cells = bytearray(self.cells)
+        other.heights = self.heights[:]
+        other.moves = self.moves
+        other.hash = self.hash
+        other.counts = [self.counts[0][:], self.counts[1][:]]
+        other.fours[0] = self.fours[0]
+        other.fours[1] = self.fours[1]
+        other.scores[0] = self.scores[0]
+        other.scores[1] = self.scores[1]
+        return other
+
+    def mask(self):
+        """
+        Gibt die Bitmaske aller belegten Zellen zurück.
+        """
+        masks = self.masks
+        return masks[0] | masks[1]
+
+    def cell(self, row, col):
+        """
+        Gibt den Spielerindex in Zelle (row, col) zurück oder None, wenn leer.
+        """
+        value = self.cells[col * H1 + row]
+        return value - 1 if value else None
+
+    def is_win(self, player):
+        """
+        True, wenn der Spieler player vier Steine in einer Reihe hat.
+        """
+        return self.fours[player] > 0
+
+    def wins_at(self, row, col, player):
+        """
+        True, wenn ein Stein des Spielers player in der freien Zelle
+        (row, col) vier in einer Reihe vervollständigen würde. Geprüft
+        werden nur die Fensterzähler der Zelle (ohne Bitmasken).
+        """
+        own = self.counts[player]
+        opp = self.counts[1 - player]
+        for w in CELL_WINDOWS[col * H1 + row]:
+            if own[w] == 3 and not opp[w]:
+                return True
+        return False
+
+    def _update(self, index, player, delta):
+        """
+        Passt die Fenster der Zelle index um delta Steine des Spielers an.
+        """
+        own = self.counts[player]
+        opp = self.counts[1 - player]
+        own_score = 0
+        opp_score = 0
+        fours = 0
+        for w in CELL_WINDOWS[index]:
+            o = own[w]
+            p = opp[w]
+            # Alter Beitrag abziehen, neuer Beitrag addieren
+            own_score += WINDOW_SCORE[(o + delta) * 5 + p] - WINDOW_SCORE[o * 5 + p]
+            opp_score += WINDOW_SCORE[p * 5 + o + delta] - WINDOW_SCORE[p * 5 + o]
+            if o + delta == 4:
+                fours += 1
+            elif o == 4:
+                fours -= 1
+            own[w] = o + delta
+        if index // H1 == CENTER_COL:
+            own_score += delta * CENTER_WEIGHT
+        self.scores[player] += own_score
+        self.scores[1 - player] += opp_score
+        self.fours[player] += fours
+
+    def play(self, col, player):
+        """
+        Setzt einen Stein und aktualisiert die Bewertung.
+
+        Rückgabe:
+            Die Zeile, in der der Stein gelandet ist.
+        """
+        row = self.heights[col]
+        index = col * H1 + row
+        self.cells[index] = player + 1
+        self.hash ^= ZOBRIST[player][index]
+        self.heights[col] = row + 1
+        self.moves += 1
+        self._update(index, player, 1)
+        return row
+
+    def undo(self, col, player):
+        """
+        Nimmt den obersten Stein der Spalte zurück und aktualisiert die Bewertung.
+        """
+        row = self.heights[col] - 1
+        index = col * H1 + row
+        self.cells[index] = 0
+        self.hash ^= ZOBRIST[player][index]
+        self.heights[col] = row
+        self.moves -= 1
+        self._update(index, player, -1)
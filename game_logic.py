@@ -1,23 +1,83 @@
-import random
-from pybricks.hubs import EV3Brick
-from pybricks.parameters import Button
-from pybricks.tools import wait
+from hardware import EV3Brick, Button, wait, StopWatch, ticks_ms, ticks_diff
+from bitboard import Position
+from transposition import TranspositionTable, TT_SIZE, EXACT, LOWER, UPPER
+from timing import SearchTimer, SearchTimeout
+from ordering import MoveOrdering
+from evaluation import EvaluatedPosition
+from solver import solve, result_of, SOLVER_EMPTY_CELLS, SOLVER_TT_SIZE, WIN, LOSS
+from ponder import Ponderer, PONDER_INSTANT_DEPTH
+from motion import DEFAULT_PROFILE, DrawJob, move_xy_steps, pen_down, pen_up
+from stats import SearchStats, HeapMonitor
 
 # Spielfeld-Konstanten
 ROWS = 6  # Anzahl der Zeilen
 COLS = 7  # Anzahl der Spalten
-PLAYER = '🔴'  # Symbol für den menschlichen Spieler
-AI = '🟡'  # Symbol für den KI-Spieler
-EMPTY = ' '  # Symbol für leere Felder
+EMPTY = 0  # Code für leere Felder
+PLAYER = 1  # Code für den menschlichen Spieler
+AI = 2  # Code für den KI-Spieler
+SYMBOLS = ('   ', ' 🔴 ', ' 🟡 ')  # Code -> Anzeige im Terminal
+PIECES = (PLAYER, AI)  # Spielerindex in der Bitboard-Position -> Code
+PIECE_INDEX = {PLAYER: 0, AI: 1}  # Code -> Spielerindex
+PLAYER_INDEX = 0  # Spielerindex des menschlichen Spielers
+AI_INDEX = 1  # Spielerindex der KI
+
+# Bewertungen von Endpositionen
+WIN_SCORE = 100000000000000  # AI gewinnt
+LOSS_SCORE = -10000000000000  # Spieler gewinnt
+
+AI_TIME_MS = 3000  # Standard-Zeitbudget pro KI-Zug in Millisekunden
+
+# Vorab angelegte Werte für die Suche (keine Heap-Allokation je Knoten)
+INF = float('inf')
+NEG_INF = -INF
+BEST_MOVES = [None] * (ROWS * COLS + 1)  # Bester Zug je Anzahl gespielter Steine
+UNORDERED = MoveOrdering(False)  # Zugpuffer für die Suche ohne Zugsortierung
 
 def create_board():
     """
     Erstellt ein leeres Spielfeld.
     
     Rückgabe:
-        Ein 2D-Array mit ROWS×COLS Größe, gefüllt mit EMPTY.
+        Eine leere Bitboard-Position mit inkrementeller Bewertung
+        (siehe evaluation.EvaluatedPosition).
     """
-    return [[EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    return EvaluatedPosition()
+
+def board_to_grid(board):
+    """
+    Wandelt eine Bitboard-Position in ein 2D-Array um.
+    
+    Parameter:
+        board: Das Spielfeld als Position
+        
+    Rückgabe:
+        Ein 2D-Array mit ROWS×COLS Größe, gefüllt mit PLAYER, AI oder EMPTY.
+    """
+    grid = [[EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    for r in range(ROWS):
+        for c in range(COLS):
+            index = board.cell(r, c)
+            if index is not None:
+                grid[r][c] = PIECES[index]
+    return grid
+
+def grid_to_board(grid):
+    """
+    Wandelt ein 2D-Array (Zeile 0 unten) in eine Bitboard-Position um.
+    
+    Parameter:
+        grid: Ein 2D-Array mit ROWS×COLS Größe
+        
+    Rückgabe:
+        Die entsprechende Position.
+    """
+    board = create_board()
+    for c in range(COLS):
+        for r in range(ROWS):
+            if grid[r][c] == EMPTY:
+                break
+            board.play(c, PIECE_INDEX[grid[r][c]])
+    return board
 
 def drop_piece(board, row, col, piece):
     """
@@ -25,11 +85,11 @@ def drop_piece(board, row, col, piece):
     
     Parameter:
         board: Das Spielfeld
-        row: Die Zeile
+        row: Die Zeile (muss die nächste freie Zeile der Spalte sein)
         col: Die Spalte
         piece: Der Spielstein (PLAYER oder AI)
     """
-    board[row][col] = piece
+    board.play(col, PIECE_INDEX[piece])
 
 def is_valid_location(board, col):
     """
@@ -42,7 +102,7 @@ def is_valid_location(board, col):
     Rückgabe:
         True, wenn die Spalte noch nicht voll ist, sonst False.
     """
-    return board[ROWS-1][col] == EMPTY
+    return board.can_play(col)
 
 def get_next_open_row(board, col):
     """
@@ -55,9 +115,7 @@ def get_next_open_row(board, col):
     Rückgabe:
         Der Index der untersten freien Zeile in der angegebenen Spalte.
     """
-    for r in range(ROWS):
-        if board[r][col] == EMPTY:
-            return r
+    return board.heights[col]
 
 def winning_move(board, piece):
     """
@@ -71,31 +129,7 @@ def winning_move(board, piece):
         True, wenn der Spieler mit dem angegebenen Spielstein gewonnen hat,
         sonst False.
     """
-    # Horizontale Überprüfung
-    for c in range(COLS-3):
-        for r in range(ROWS):
-            if board[r][c] == piece and board[r][c+1] == piece and board[r][c+2] == piece and board[r][c+3] == piece:
-                return True
-
-    # Vertikale Überprüfung
-    for c in range(COLS):
-        for r in range(ROWS-3):
-            if board[r][c] == piece and board[r+1][c] == piece and board[r+2][c] == piece and board[r+3][c] == piece:
-                return True
-
-    # Diagonale Überprüfung (ansteigend)
-    for c in range(COLS-3):
-        for r in range(ROWS-3):
-            if board[r][c] == piece and board[r+1][c+1] == piece and board[r+2][c+2] == piece and board[r+3][c+3] == piece:
-                return True
-
-    # Diagonale Überprüfung (abfallend)
-    for c in range(COLS-3):
-        for r in range(3, ROWS):
-            if board[r][c] == piece and board[r-1][c+1] == piece and board[r-2][c+2] == piece and board[r-3][c+3] == piece:
-                return True
-
-    return False
+    return board.is_win(PIECE_INDEX[piece])
 
 def evaluate_window(window, piece):
     """
@@ -136,6 +170,10 @@ def score_position(board, piece):
     Rückgabe:
         Eine Gesamtpunktzahl für die aktuelle Position.
     """
+    if isinstance(board, EvaluatedPosition):
+        return board.scores[PIECE_INDEX[piece]]  # Inkrementell mitgeführte Bewertung
+    if isinstance(board, Position):
+        board = board_to_grid(board)  # Fensterbewertung arbeitet auf dem 2D-Array
     score = 0
 
     # Mittlere Spalte bewerten (strategisch wertvoll)
@@ -181,9 +219,96 @@ def is_terminal_node(board):
     Rückgabe:
         True, wenn das Spiel beendet ist, sonst False.
     """
-    return winning_move(board, PLAYER) or winning_move(board, AI) or len(get_valid_locations(board)) == 0
+    return board.is_win(0) or board.is_win(1) or board.is_full()
+
+def winning_column(board, player):
+    """
+    Sucht eine Spalte, mit der der Spieler sofort gewinnt.
+    
+    Parameter:
+        board: Das Spielfeld
+        player: Spielerindex, der am Zug ist
+        
+    Rückgabe:
+        Die Spalte oder None.
+    """
+    heights = board.heights
+    for col in range(COLS):
+        row = heights[col]
+        if row < ROWS and board.wins_at(row, col, player):
+            return col
+    return None
 
-def minimax(board, depth, alpha, beta, maximizingPlayer):
+def forced_move(board, player):
+    """
+    Ermittelt einen Zug, der ohne Suche feststeht: ein sofortiger Gewinn
+    oder die Abwehr einer einzelnen gegnerischen Drohung.
+    
+    Parameter:
+        board: Das Spielfeld
+        player: Spielerindex, der am Zug ist
+        
+    Rückgabe:
+        Die Spalte oder None, wenn gesucht werden muss.
+    """
+    col = winning_column(board, player)
+    if col is not None:
+        return col
+    block = None
+    heights = board.heights
+    for col in range(COLS):
+        row = heights[col]
+        if row < ROWS and board.wins_at(row, col, 1 - player):
+            if block is not None:
+                return None  # Zwei Drohungen: verloren, die Suche wählt den Zug
+            block = col
+    return block
+
+def prune_threats(board, player, moves, count):
+    """
+    Verkleinert die Zugliste eines Knotens anhand der Drohungen des Gegners
+    (die Liste wird an Ort und Stelle verändert, die Reihenfolge bleibt):
+        - Eine einzelne gegnerische Gewinnzelle, die sofort bespielbar ist,
+          muss blockiert werden; nur dieser Zug bleibt übrig.
+        - Züge direkt unter eine gegnerische Gewinnzelle entfallen, weil der
+          Gegner darauf sofort gewinnt.
+    Ist die Stellung ohnehin verloren (zwei Drohungen oder nur Züge unter
+    eine Gewinnzelle), bleibt die Liste unverändert, damit das Ergebnis
+    nicht von der Zugreihenfolge abhängt. Ein eigener Gewinnzug muss vorher
+    ausgeschlossen sein (siehe winning_column).
+    
+    Parameter:
+        board: Das Spielfeld
+        player: Spielerindex, der am Zug ist
+        moves: Zugliste (z. B. Puffer der Zugsortierung)
+        count: Anzahl der gültigen Einträge in moves
+        
+    Rückgabe:
+        Neue Anzahl der Züge.
+    """
+    opponent = 1 - player
+    heights = board.heights
+    block = -1
+    for i in range(count):
+        col = moves[i]
+        if board.wins_at(heights[col], col, opponent):
+            if block >= 0:
+                return count  # Zwei Drohungen: verloren
+            block = col
+    if block >= 0:
+        moves[0] = block  # Erzwungener Block
+        return 1
+    n = 0
+    for i in range(count):
+        col = moves[i]
+        row = heights[col] + 1
+        if row >= ROWS or not board.wins_at(row, col, opponent):
+            moves[n] = col
+            n += 1
+    return n if n > 0 else count  # Alle Züge verlieren: Liste unverändert (nichts geschrieben)
+
+def minimax(board, depth, alpha, beta, maximizingPlayer, tt=None, timer=None, first=None,
+            ordering=None, stats=None, threats=True):
     """
     Minimax-Algorithmus mit Alpha-Beta-Pruning zur Bestimmung des besten Zuges.
     
@@ -193,34 +318,118 @@ def minimax(board, depth, alpha, beta, maximizingPlayer):
         alpha: Alpha-Wert für Alpha-Beta-Pruning
         beta: Beta-Wert für Alpha-Beta-Pruning
         maximizingPlayer: True, wenn der maximierende Spieler am Zug ist (AI)
+        tt: Optionale Transpositionstabelle (siehe transposition.py)
+        timer: Optionaler SearchTimer; löst SearchTimeout aus, wenn die Zeit abläuft
+        first: Optionale Spalte, die an diesem Knoten zuerst durchsucht wird
+        ordering: Optionale MoveOrdering (siehe ordering.py); ohne sie werden
+                  die Spalten von links nach rechts durchsucht
+        stats: Optionale SearchStats (siehe stats.py)
+        threats: True spielt an jedem Knoten sofortige Gewinne und erzwungene
+                 Blocks ohne Verzweigung und überspringt Züge unter eine
+                 gegnerische Gewinnzelle (siehe prune_threats)
         
     Rückgabe:
         Tuple (Spalte, Bewertung) mit dem besten Zug und dessen Bewertung
     """
-    valid_locations = get_valid_locations(board)
-    is_terminal = is_terminal_node(board)
+    value = _search(board, depth, alpha, beta, maximizingPlayer, tt, timer, first,
+                    ordering if ordering is not None else UNORDERED, stats, threats)
+    return BEST_MOVES[board.moves], value
+
+def _search(board, depth, alpha, beta, maximizingPlayer, tt, timer, first, ordering, stats, threats):
+    """
+    Rekursiver Teil von minimax. Gibt nur die Bewertung zurück und legt den
+    besten Zug in BEST_MOVES[board.moves] ab, damit je Knoten kein Tuple
+    entsteht. Die Züge stehen im Puffer der Zugsortierung für diese Ebene.
+    """
+    if timer is not None:
+        timer.tick()  # Zeitbudget prüfen
+    if stats is not None:
+        stats.nodes += 1
+        if stats.heap is not None and not stats.nodes & 63:
+            stats.heap.sample()  # Speicherverbrauch stichprobenartig erfassen
+    ply = board.moves
+    ai_wins = board.is_win(AI_INDEX)
+    player_wins = board.is_win(PLAYER_INDEX)
+    is_terminal = ai_wins or player_wins or board.is_full()
     
     # Basisfall: Maximale Tiefe erreicht oder Endposition
     if depth == 0 or is_terminal:
+        BEST_MOVES[ply] = None
+        if stats is not None:
+            if is_terminal:
+                stats.terminals += 1
+            else:
+                stats.leaves += 1
         if is_terminal:
-            if winning_move(board, AI):
-                return (None, 100000000000000)  # AI gewinnt
-            elif winning_move(board, PLAYER):
-                return (None, -10000000000000)  # Spieler gewinnt
+            if ai_wins:
+                return WIN_SCORE  # AI gewinnt
+            elif player_wins:
+                return LOSS_SCORE  # Spieler gewinnt
             else:  # Unentschieden (keine weiteren Züge möglich)
-                return (None, 0)
+                return 0
         else:  # Maximale Tiefe erreicht
-            return (None, score_position(board, AI))
+            return score_position(board, AI)
+
+    # Sofortiger Gewinn: ohne Verzweigung und ohne Tabellenzugriff
+    player = AI_INDEX if maximizingPlayer else PLAYER_INDEX
+    if threats:
+        column = winning_column(board, player)
+        if column is not None:
+            BEST_MOVES[ply] = column
+            if stats is not None:
+                stats.threat_wins += 1
+            return WIN_SCORE if maximizingPlayer else LOSS_SCORE
+
+    # Transpositionstabelle abfragen
+    alpha_orig = alpha
+    beta_orig = beta
+    tt_move = None
+    if tt is not None:
+        entry = tt.probe(board.hash)
+        if stats is not None:
+            stats.tt_probes += 1
+        if entry >= 0 and is_valid_location(board, tt.moves[entry]):
+            tt_move = tt.moves[entry]
+            if tt.depths[entry] >= depth:
+                if stats is not None:
+                    stats.tt_hits += 1
+                tt_value = tt.values[entry]
+                tt_flag = tt.flags[entry]
+                if tt_flag == EXACT:
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    BEST_MOVES[ply] = tt_move
+                    return tt_value
+                elif tt_flag == LOWER:
+                    alpha = max(alpha, tt_value)
+                else:
+                    beta = min(beta, tt_value)
+                if alpha >= beta:
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    BEST_MOVES[ply] = tt_move
+                    return tt_value
+
+    # Zugreihenfolge bestimmen (im Puffer der Ebene, ohne neue Liste)
+    if first is None:
+        first = tt_move
+    count = ordering.fill(board, player, first)
+    moves = ordering.buffers[ply]
+    if threats:
+        pruned = prune_threats(board, player, moves, count)
+        if stats is not None and pruned < count:
+            stats.threat_prunes += 1
+        count = pruned
+    column = moves[0]  # Standardwert, falls keine Verbesserung gefunden wird
             
     if maximizingPlayer:  # AI ist am Zug (maximierend)
-        value = -float('inf')
-        column = random.choice(valid_locations)  # Standardwert, falls keine Verbesserung gefunden wird
+        value = NEG_INF
         
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = [row[:] for row in board]  # Kopie des Spielfelds erstellen
-            drop_piece(b_copy, row, col, AI)  # Testweise Stein setzen
-            new_score = minimax(b_copy, depth-1, alpha, beta, False)[1]  # Bewertung des Zuges ermitteln
+        for i in range(count):
+            col = moves[i]
+            board.play(col, player)  # Testweise Stein setzen
+            new_score = _search(board, depth-1, alpha, beta, False, tt, timer, None, ordering, stats, threats)  # Bewertung des Zuges ermitteln
+            board.undo(col, player)  # Zug zurücknehmen
             
             if new_score > value:  # Besseren Zug gefunden
                 value = new_score
@@ -228,19 +437,19 @@ def minimax(board, depth, alpha, beta, maximizingPlayer):
                 
             alpha = max(alpha, value)  # Alpha-Wert aktualisieren
             if alpha >= beta:  # Beta-Cutoff
+                ordering.cutoff(board, player, col, depth)
+                if stats is not None:
+                    stats.cutoffs[i] += 1
                 break
-                
-        return column, value
 
     else:  # Spieler ist am Zug (minimierend)
-        value = float('inf')
-        column = random.choice(valid_locations)  # Standardwert, falls keine Verbesserung gefunden wird
+        value = INF
         
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = [row[:] for row in board]  # Kopie des Spielfelds erstellen
-            drop_piece(b_copy, row, col, PLAYER)  # Testweise Stein setzen
-            new_score = minimax(b_copy, depth-1, alpha, beta, True)[1]  # Bewertung des Zuges ermitteln
+        for i in range(count):
+            col = moves[i]
+            board.play(col, player)  # Testweise Stein setzen
+            new_score = _search(board, depth-1, alpha, beta, True, tt, timer, None, ordering, stats, threats)  # Bewertung des Zuges ermitteln
+            board.undo(col, player)  # Zug zurücknehmen
             
             if new_score < value:  # Besseren Zug gefunden (minimierend)
                 value = new_score
@@ -248,9 +457,70 @@ def minimax(board, depth, alpha, beta, maximizingPlayer):
                 
             beta = min(beta, value)  # Beta-Wert aktualisieren
             if alpha >= beta:  # Alpha-Cutoff
+                ordering.cutoff(board, player, col, depth)
+                if stats is not None:
+                    stats.cutoffs[i] += 1
                 break
+
+    # Ergebnis in der Transpositionstabelle speichern
+    if tt is not None:
+        if value <= alpha_orig:
+            tt.store(board.hash, depth, value, UPPER, column)
+        elif value >= beta_orig:
+            tt.store(board.hash, depth, value, LOWER, column)
+        else:
+            tt.store(board.hash, depth, value, EXACT, column)
                 
-        return column, value
+    BEST_MOVES[ply] = column
+    return value
+
+def iterative_deepening(board, time_ms, tt=None, max_depth=None, ordering=None, stats=None,
+                        maximizingPlayer=True, threats=True, background=None):
+    """
+    Iterative Vertiefung für den KI-Zug mit festem Zeitbudget.
+    Sucht mit Tiefe 1, 2, 3, ... und gibt das Ergebnis der letzten
+    vollständig abgeschlossenen Iteration zurück. Der beste Zug einer
+    Iteration wird in der nächsten zuerst durchsucht.
+    
+    Parameter:
+        board: Das Spielfeld (AI ist am Zug)
+        time_ms: Zeitbudget in Millisekunden
+        tt: Optionale Transpositionstabelle
+        max_depth: Maximale Suchtiefe (Standard: Anzahl freier Felder)
+        ordering: Optionale MoveOrdering für Killer- und History-Heuristik
+        stats: Optionale SearchStats; erhält zusätzlich die Dauer je Tiefe
+        maximizingPlayer: False, wenn der Spieler am Zug ist (Analyse)
+        threats: False schaltet die Drohungsprüfung der Suche ab (siehe minimax)
+        background: Optionale Funktion, die während der Suche regelmäßig
+                    aufgerufen wird (z. B. DrawJob.poll)
+        
+    Rückgabe:
+        Tuple (Spalte, Bewertung, Tiefe) der letzten abgeschlossenen Iteration
+    """
+    if max_depth is None:
+        max_depth = ROWS * COLS - board.moves
+    timer = SearchTimer(time_ms, hook=background)
+
+    # Tiefe 1 wird immer vollständig durchsucht, damit ein Zug vorliegt
+    column, value = minimax(board, 1, NEG_INF, INF, maximizingPlayer, tt, None, None,
+                            ordering, stats, threats)
+    depth = 1
+    if stats is not None:
+        stats.record_depth(1, timer.elapsed())
+
+    while depth < max_depth and value != WIN_SCORE and value != LOSS_SCORE:
+        search_board = board.copy()  # Bei Zeitablauf bleibt board unverändert
+        try:
+            result = minimax(search_board, depth + 1, NEG_INF, INF, maximizingPlayer,
+                             tt, timer, column, ordering, stats, threats)
+        except SearchTimeout:
+            break
+        column, value = result
+        depth += 1
+        if stats is not None:
+            stats.record_depth(depth, timer.elapsed())
+
+    return column, value, depth
 
 def get_valid_locations(board):
     """
@@ -260,18 +530,17 @@ def get_valid_locations(board):
         Eine Liste der Spaltenindizes, die noch nicht voll sind.
     """
     valid_locations = []
+    heights = board.heights
     for col in range(COLS):
-        if is_valid_location(board, col):
+        if heights[col] < ROWS:
             valid_locations.append(col)
     return valid_locations
 
-def draw_piece(motor_a, motor_b, motor_c, row, col, piece,
-               max_height: int,
-               min_height: int,
-               field_width: int):
+def piece_steps(motor_a, motor_b, motor_c, row, col, piece,
+                max_height, min_height, field_width, profile=DEFAULT_PROFILE):
     """
-    Zeichnet einen Spielstein auf dem physischen Spielfeld.
-    
+    Schritte für einen DrawJob (siehe motion.py), die einen Spielstein
+    zeichnen, ohne auf die Motoren zu warten.
     """
     # Berechnung der Zellengröße
     cell_width = field_width / COLS
@@ -281,42 +550,111 @@ def draw_piece(motor_a, motor_b, motor_c, row, col, piece,
     x = (col * cell_width) + (cell_width / 2)
     y = (ROWS - 1 - row) * cell_height + min_height + (cell_height / 2)
 
-    # Bewege den Stift an die richtige Position
-    motor_b.run_target(500, -x)
-    motor_c.run_target(500, y)
-
     # Zeichne entweder ein X (für Spieler) oder ein Minus (für KI)
     if piece == PLAYER:
-        draw_cross(motor_a, motor_b, motor_c)
+        # Startpunkt des Kreuzes liegt 40° rechts der Mitte: direkt dorthin fahren
+        yield from move_xy_steps(motor_b, motor_c, -x + 40, y, profile.travel_speed, profile)
+        yield from cross_steps(motor_a, motor_b, motor_c, profile)
     else:
-        draw_minus(motor_a, motor_b, motor_c)
+        yield from move_xy_steps(motor_b, motor_c, -x, y, profile.travel_speed, profile)
+        yield from minus_steps(motor_a, motor_b, motor_c, profile)
+
+def draw_piece(motor_a, motor_b, motor_c, row, col, piece,
+               max_height: int,
+               min_height: int,
+               field_width: int,
+               profile=DEFAULT_PROFILE):
+    """
+    Zeichnet einen Spielstein auf dem physischen Spielfeld.
+    
+    Rückgabe:
+        Die Zeichenzeit in Millisekunden.
+    """
+    return DrawJob(piece_steps(motor_a, motor_b, motor_c, row, col, piece,
+                               max_height, min_height, field_width, profile)).finish()
 
 
-def draw_cross(motor_a, motor_b, motor_c):
+def cross_steps(motor_a, motor_b, motor_c, profile=DEFAULT_PROFILE):
     """
-    Zeichnet ein Kreuz (X) für den Spieler.
+    Schritte für ein Kreuz (X), beginnend 40° rechts der Zellenmitte.
     
     """
-    motor_b.run_angle(200, 40)  # 40° nach rechts bewegen
-    motor_a.run_angle(200, -180)  # Stift absenken
-    motor_b.run_angle(200, -80)  # 80° nach links bewegen
-    motor_b.run_angle(200, 40)  # 40° nach rechts bewegen
-    motor_c.run_angle(200, 50)  # 50° nach unten bewegen
-    motor_c.run_angle(200, -90)  # 90° nach oben bewegen
-    motor_c.run_angle(200, 60)  # 60° nach unten bewegen
-    motor_a.run_angle(200, 180)  # Stift anheben
+    speed = profile.mark_speed
+    yield pen_down(motor_a, profile, speed, False)  # Stift absenken
+    motor_b.run_angle(speed, -80, wait=False)  # 80° nach links bewegen
+    yield (motor_b,)
+    motor_b.run_angle(speed, 40, wait=False)  # 40° nach rechts bewegen
+    yield (motor_b,)
+    motor_c.run_angle(speed, 50, wait=False)  # 50° nach unten bewegen
+    yield (motor_c,)
+    motor_c.run_angle(speed, -90, wait=False)  # 90° nach oben bewegen
+    yield (motor_c,)
+    motor_c.run_angle(speed, 60, wait=False)  # 60° nach unten bewegen
+    yield (motor_c,)
+    yield pen_up(motor_a, profile, speed, False)  # Stift anheben
+
+def minus_steps(motor_a, motor_b, motor_c, profile=DEFAULT_PROFILE):
+    """
+    Schritte für ein Minus (-).
+    
+    """
+    speed = profile.mark_speed
+    yield pen_down(motor_a, profile, speed, False)  # Stift absenken
+    motor_b.run_angle(speed, 50, wait=False)  # 50° nach rechts bewegen
+    yield (motor_b,)
+    motor_b.run_angle(speed, -80, wait=False)  # 80° nach links bewegen
+    yield (motor_b,)
+    yield pen_up(motor_a, profile, speed, False)  # Stift anheben
+
+def draw_cross(motor_a, motor_b, motor_c, profile=DEFAULT_PROFILE):
+    """
+    Zeichnet ein Kreuz (X) für den Spieler, beginnend 40° rechts der Zellenmitte.
+    
+    """
+    DrawJob(cross_steps(motor_a, motor_b, motor_c, profile)).finish()
 
-def draw_minus(motor_a, motor_b, motor_c):
+def draw_minus(motor_a, motor_b, motor_c, profile=DEFAULT_PROFILE):
     """
     Zeichnet ein Minus (-) für die KI.
     
     """
-    motor_a.run_angle(200, -180)  # Stift absenken
-    motor_b.run_angle(200, 50)  # 50° nach rechts bewegen
-    motor_b.run_angle(200, -80)  # 80° nach links bewegen
-    motor_a.run_angle(200, 180)  # Stift anheben
+    DrawJob(minus_steps(motor_a, motor_b, motor_c, profile)).finish()
 
-def play_game(motor_a, motor_b, motor_c, max_height, min_height, field_width):
+class Engine:
+    """
+    Suchzustand der KI, der über mehrere Spiele einer Sitzung erhalten
+    bleibt. Die Einträge der Transpositionstabellen hängen nur von der
+    Stellung ab und bleiben daher auch im nächsten Spiel gültig.
+    
+    Attribute:
+        tt: Transpositionstabelle der Minimax-Suche
+        ordering: Zugsortierung (Killer- und History-Heuristik)
+        solver_tt: Eigene Tabelle für den Endspiel-Löser
+        book: Optionales Eröffnungsbuch (siehe book.py)
+        games: Anzahl der begonnenen Spiele
+    """
+
+    def __init__(self, tt_size=TT_SIZE, move_ordering=True, book=None):
+        self.tt = TranspositionTable(tt_size)
+        self.ordering = MoveOrdering(move_ordering)
+        self.solver_tt = TranspositionTable(SOLVER_TT_SIZE)
+        self.book = book
+        self.games = 0
+
+    def new_game(self):
+        """
+        Bereitet die Tabellen auf ein neues Spiel vor, ohne sie zu leeren.
+        """
+        self.tt.new_search()
+        self.solver_tt.new_search()
+        self.ordering.new_search()
+        self.games += 1
+
+def play_game(motor_a, motor_b, motor_c, max_height, min_height, field_width,
+              tt_size=TT_SIZE, time_ms=AI_TIME_MS, move_ordering=True,
+              solver_empty=SOLVER_EMPTY_CELLS, book=None, ponder=True,
+              profile=DEFAULT_PROFILE, on_move=None, engine=None, heap_report=False,
+              recorder=None, threats=True, overlap=True):
     """
     Steuert den Spielablauf zwischen Spieler und KI.
     
@@ -327,51 +665,193 @@ def play_game(motor_a, motor_b, motor_c, max_height, min_height, field_width):
         max_height: Maximale Höhe des Spielfelds
         min_height: Minimale Höhe des Spielfelds
         field_width: Breite des Spielfelds
+        tt_size: Anzahl der Einträge der Transpositionstabelle
+        time_ms: Zeitbudget pro KI-Zug in Millisekunden
+        move_ordering: False schaltet Killer-/History-Sortierung ab (Vergleichsmessung)
+        solver_empty: Unter dieser Anzahl freier Felder spielt der exakte Löser
+        book: Optionales Eröffnungsbuch (siehe book.py)
+        ponder: True, um während der Eingabe des Spielers vorauszurechnen
+        profile: Bewegungsprofil des Plotters (siehe motion.py)
+        on_move: Optionale Funktion, die nach jedem KI-Zug mit einem Dictionary
+                 (Halbzug, Spalte, Quelle, Tiefe, Bewertung, Zeit, Suchstatistik,
+                 Zeichenzeit des Spielersteins, Wartezeit auf den Plotter)
+                 aufgerufen wird, z. B. stats.screen_logger oder stats.TraceFile
+        engine: Optionale Engine aus einer Sitzung; dann werden deren Tabellen
+                und Eröffnungsbuch verwendet und tt_size, move_ordering und
+                book ignoriert
+        heap_report: True gibt je KI-Zug Spitzenbelegung des Heaps und Anzahl
+                     der Garbage Collections aus (auch in on_move als 'heap')
+        recorder: Optionaler record.GameRecorder; schreibt Züge, Bedenkzeiten
+                  und Suchdaten des Spiels in das Spielprotokoll
+        threats: True spielt sofortige Gewinne und erzwungene Blocks ohne
+                 Suche und verwendet die Drohungsprüfung in der Suche
+        overlap: True startet die KI-Suche, während der Plotter den Stein des
+                 Spielers noch zeichnet (False: erst zeichnen, dann suchen)
+        
+    Rückgabe:
+        Dictionary mit Gewinner ('player', 'ai' oder 'draw'), Anzahl der
+        Halbzüge sowie Spieldauer, Rechenzeit der KI, Zeichenzeit und durch
+        overlap eingesparte Wartezeit in ms.
     """
+    if engine is None:
+        engine = Engine(tt_size, move_ordering, book)
+    engine.new_game()
     board = create_board()  # Leeres Spielfeld erstellen
+    tt = engine.tt  # Transpositionstabelle für die KI-Suche
+    ordering = engine.ordering  # Zugsortierung für die KI-Suche
+    solver_tt = engine.solver_tt  # Eigene Tabelle für den Endspiel-Löser
+    book = engine.book
     game_over = False  # Spiel läuft
+    winner = 'draw'  # Ergebnis, falls das Spielfeld voll wird
     turn = 0  # 0 für Spieler, 1 für KI
+    ponderer = None  # Vorausberechnung während der Eingabe des Spielers
+    draw_ms = 0  # Gesamte Zeichenzeit der Spielsteine
+    ai_ms = 0  # Gesamte Rechenzeit der KI
+    drawing = None  # Zeichenauftrag für den Stein des Spielers (DrawJob)
+    player_draw_ms = 0  # Zeichenzeit des letzten Spielersteins
+    saved_ms = 0  # Durch Überlappung von Zeichnen und Suche gesparte Zeit
+    watch = StopWatch()  # Spieldauer messen
+    heap = HeapMonitor() if heap_report else None
+    stats = SearchStats(heap) if on_move is not None or heap_report or recorder is not None else None  # Nur mit Protokoll zählen
+    if recorder is not None:
+        recorder.begin()
+
+    def ponder_search(position, depth, timer, first):
+        return minimax(position, depth, NEG_INF, INF, True,
+                       tt, timer, first, ordering, None, threats)
 
     while not game_over:
         if turn == 0:
             # Spielerzug
-            col = player_input_via_ev3()  # Warte auf Eingabe des Spielers über EV3
+            player_draw_ms = 0
+            if ponder and ROWS * COLS - board.moves - 1 >= solver_empty:
+                tt.new_search()
+                ponderer = Ponderer(board, PIECE_INDEX[PLAYER], ponder_search)
+            start = ticks_ms()
+            col = player_input_via_ev3(ponderer)  # Warte auf Eingabe des Spielers über EV3
+            while not is_valid_location(board, col):
+                # Volle Spalte: erneut fragen, der Spieler bleibt am Zug
+                print("Spalte " + str(col + 1) + " ist voll")
+                col = player_input_via_ev3(ponderer)
+
+            if recorder is not None:
+                recorder.move(col, ticks_diff(ticks_ms(), start))
+            row = get_next_open_row(board, col)  # Ermittle die unterste freie Zeile
+            drop_piece(board, row, col, PLAYER)  # Spielstein setzen
+            show_board(board)  # Spielfeld im Terminal anzeigen
             
-            if is_valid_location(board, col):
-                row = get_next_open_row(board, col)  # Ermittle die unterste freie Zeile
-                drop_piece(board, row, col, PLAYER)  # Spielstein setzen
-                show_board(board)  # Spielfeld im Terminal anzeigen
-                
-                # Spielstein physisch zeichnen
-                draw_piece(motor_a, motor_b, motor_c, row, col, PLAYER,
-                           max_height, min_height, field_width)
-
-                # Überprüfe auf Sieg
-                if winning_move(board, PLAYER):
-                    print("Spieler X gewinnt!")
-                    game_over = True
+            # Spielstein physisch zeichnen; mit overlap zeichnet der Plotter
+            # weiter, während die KI bereits sucht (siehe motion.DrawJob)
+            drawing = DrawJob(piece_steps(motor_a, motor_b, motor_c, row, col, PLAYER,
+                                          max_height, min_height, field_width, profile))
+            if not overlap:
+                player_draw_ms = drawing.finish()
+                draw_ms += player_draw_ms
+                drawing = None
+
+            # Überprüfe auf Sieg
+            if winning_move(board, PLAYER):
+                print("Spieler X gewinnt!")
+                winner = 'player'
+                game_over = True
 
         else:
             # KI-Zug
-            col, minimax_score = minimax(board, 3, -float('inf'), float('inf'), True)  # KI wählt Spalte
+            start = ticks_ms()
+            depth = 0
+            value = None
+            if stats is not None:
+                stats.reset()
+            if heap is not None:
+                heap.start()
+            col = book.lookup(board) if book is not None else None  # Zuerst im Eröffnungsbuch nachsehen
+            source = 'book'
+            if col is None and threats:
+                col = forced_move(board, AI_INDEX)  # Gewinn oder Block steht ohne Suche fest
+                source = 'threat'
+            if col is not None:
+                print(("Buchzug" if source == 'book' else "Erzwungener Zug") + ": Spalte " + str(col + 1))
+            elif ROWS * COLS - board.moves < solver_empty:
+                # Endspiel: exakt lösen (schnellster Sieg bzw. längste Verteidigung)
+                source = 'solver'
+                col, value = solve(board, PIECE_INDEX[AI], solver_tt)
+                result, plies = result_of(board, value)
+                if result == WIN:
+                    print("KI gewinnt in " + str(plies) + " Halbzügen")
+                elif result == LOSS:
+                    print("KI verliert in " + str(plies) + " Halbzügen")
+                else:
+                    print("Unentschieden")
+            else:
+                pondered = ponderer.lookup(board) if ponderer is not None else None
+                if pondered is not None and pondered[2] >= PONDER_INSTANT_DEPTH:
+                    source = 'ponder'
+                    col, value, depth = pondered  # Antwort wurde bereits vorausberechnet
+                else:
+                    source = 'search'
+                    tt.new_search()  # Einträge früherer Züge dürfen ersetzt werden
+                    ordering.new_search()  # Ältere History-Werte abschwächen
+                    col, value, depth = iterative_deepening(board, time_ms, tt, None, ordering, stats,
+                                                            threats=threats,
+                                                            background=drawing.poll if drawing is not None else None)  # KI wählt Spalte
+            ponderer = None
+            think_ms = ticks_diff(ticks_ms(), start)
+            ai_ms += think_ms
+
+            # Auf den Stein des Spielers warten, falls der Plotter noch zeichnet
+            if drawing is not None:
+                wait_watch = StopWatch()
+                player_draw_ms = drawing.finish()
+                wait_ms = wait_watch.time()
+                draw_ms += player_draw_ms
+                drawing = None
+            else:
+                wait_ms = player_draw_ms  # Ohne overlap wartet die Suche auf die ganze Zeichnung
+            saved_ms += player_draw_ms - wait_ms
+            print("Zugzeit: Zeichnen " + str(player_draw_ms) + " ms, KI " + str(think_ms)
+                  + " ms, Wartezeit " + str(wait_ms) + " ms")
+            heap_info = heap.stop() if heap is not None else None
+            if heap_info is not None:
+                print("Heap: Spitze " + str(heap_info['heap_peak']) + " B, GC "
+                      + str(heap_info['gc_count']))
+
+            if on_move is not None:
+                on_move({
+                    'ply': board.moves,
+                    'col': col,
+                    'source': source,
+                    'depth': depth,
+                    'value': value,
+                    'time_ms': think_ms,
+                    'stats': stats.as_dict() if source == 'search' else None,
+                    'heap': heap_info,
+                    'draw_ms': player_draw_ms,
+                    'wait_ms': wait_ms,
+                })
             
+            if recorder is not None:
+                recorder.move(col, think_ms, source, depth,
+                              stats.nodes if source == 'search' else None)
+
             if is_valid_location(board, col):
                 row = get_next_open_row(board, col)  # Ermittle die unterste freie Zeile
                 drop_piece(board, row, col, AI)  # Spielstein setzen
                 show_board(board)  # Spielfeld im Terminal anzeigen
                 
                 # Spielstein physisch zeichnen
-                draw_piece(motor_a, motor_b, motor_c,
-                           row,
-                           col,
-                           AI,
-                           max_height,
-                           min_height,
-                           field_width)
+                draw_ms += draw_piece(motor_a, motor_b, motor_c,
+                                      row,
+                                      col,
+                                      AI,
+                                      max_height,
+                                      min_height,
+                                      field_width,
+                                      profile)
 
                 # Überprüfe auf Sieg
                 if winning_move(board, AI):
                     print("Spieler O (KI) gewinnt!")
+                    winner = 'ai'
                     game_over = True
 
         # Spielerwechsel
@@ -383,10 +863,27 @@ def play_game(motor_a, motor_b, motor_c, max_height, min_height, field_width):
             print("Unentschieden! Das Spielfeld ist voll.")
             game_over = True
 
-def player_input_via_ev3():
+    if drawing is not None:
+        draw_ms += drawing.finish()  # Letzter Stein des Spielers (Spielende)
+    print("Zeichenzeit Spielsteine: " + str(draw_ms) + " ms, gespart: " + str(saved_ms) + " ms")
+    if recorder is not None:
+        recorder.finish(winner)
+    return {
+        'winner': winner,
+        'moves': board.moves,
+        'duration_ms': watch.time(),
+        'ai_ms': ai_ms,
+        'draw_ms': draw_ms,
+        'saved_ms': saved_ms,
+    }
+
+def player_input_via_ev3(ponderer=None):
     """
     Ermöglicht dem Spieler die Auswahl einer Spalte über den EV3-Stein.
     
+    Parameter:
+        ponderer: Optionaler Ponderer, der zwischen den Tastenabfragen
+                  die möglichen Antworten vorausberechnet
     """
     ev3 = EV3Brick()
     selected_col = 0  # Starte mit der ersten Spalte
@@ -418,6 +915,10 @@ def player_input_via_ev3():
             # Bestätige die Auswahl mit der mittleren Taste
             ev3.screen.clear()
             return selected_col
+
+        elif ponderer is not None:
+            # Keine Taste gedrückt: Bedenkzeit des Spielers für die KI nutzen
+            ponderer.step()
         
 def show_board(board):
     """
@@ -426,13 +927,10 @@ def show_board(board):
     """
     print("\n")
     # Zeile für Zeile von oben nach unten ausgeben (umgekehrte Reihenfolge)
-    for row in reversed(board):
+    for row in reversed(board_to_grid(board)):
         print('|', end='')
         for cell in row:
-            if cell == '🔴' or cell == '🟡':
-                print(' ' + cell + ' |', end='')
-            else:
-                print('   |', end='')  # Drei Leerzeichen für leere Zellen
+            print(SYMBOLS[cell] + '|', end='')  # Drei Leerzeichen für leere Zellen
         print()  # Zeilenumbruch nach jeder Zeile
     
     # Spaltenindizes anzeigen
@@ -0,0 +1,42 @@
+"""
+Hardware-Abstraktion für den Vier-gewinnt-Plotter.
+
+Auf dem EV3 werden die pybricks-Klassen verwendet. Ist pybricks nicht
+installiert (z. B. auf einem Linux-Rechner), wird automatisch das
+simulierte Backend aus sim_ev3.py geladen. Alle anderen Module importieren
+EV3-Klassen, Parameter und Zeitfunktionen ausschließlich von hier.
+"""
+
+try:
+    from pybricks.hubs import EV3Brick
+    from pybricks.ev3devices import Motor, ColorSensor, TouchSensor
+    from pybricks.parameters import Port, Button, Color
+    from pybricks.tools import wait, StopWatch
+    from timing import ticks_ms, ticks_diff
+    BACKEND = 'ev3'  # Echte Hardware über pybricks
+except ImportError:
+    from sim_ev3 import (EV3Brick, Motor, ColorSensor, TouchSensor, Port, Button, Color, wait, StopWatch,
+                         ticks_ms, ticks_diff)
+    BACKEND = 'sim'  # Simulation (reines CPython)
+
+
+class Hardware:
+    """
+    Bündelt alle Hardware-Komponenten des Plotters.
+
+    Attribute:
+        ev3: EV3-Steuereinheit (Tasten, Bildschirm, Lautsprecher)
+        motor_a: Hebt und senkt den Stift
+        motor_b: Bewegt das Blatt horizontal (X-Achse, invertiert)
+        motor_c: Bewegt den Stift vertikal (Y-Achse)
+        light_sensor: Lichtsensor zur Kantenerkennung
+        touch_sensor: Berührungssensor für obere Kalibrierungsposition
+    """
+
+    def __init__(self):
+        self.ev3 = EV3Brick()
+        self.motor_a = Motor(Port.A)
+        self.motor_b = Motor(Port.B)
+        self.motor_c = Motor(Port.C)
+        self.light_sensor = ColorSensor(Port.S3)
+        self.touch_sensor = TouchSensor(Port.S4)
@@ -0,0 +1,131 @@
+"""
+Lasttest für server.py (nur auf dem Host).
+
+Für jede Stufe spielen N Clients gleichzeitig über je eine eigene
+Verbindung zufällige Partien gegen den Server, bis die Messdauer abgelaufen
+ist. Gemessen wird die Antwortzeit jedes move-Befehls (Zug des Spielers bis
+Antwort der KI). Ausgegeben werden je Stufe KI-Züge pro Sekunde sowie
+Median (p50) und 99. Perzentil (p99) der Antwortzeit.
+
+Aufruf (Server muss laufen):
+    python loadtest.py --port 7777 --games 1 2 4 8 16 --seconds 10
+    python loadtest.py --unix /tmp/connect4.sock
+"""
+import asyncio
+import random
+import sys
+import time
+
+from game_logic import ROWS, COLS
+from server import PORT, PLAYING
+
+LEVELS = (1, 2, 4, 8, 16)  # Standardstufen gleichzeitiger Partien
+
+
+def percentile(values, p):
+    """
+    Perzentil p (0..100) einer sortierten Liste (nächster Rang).
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(p / 100 * len(values))) - 1))
+    return values[index]
+
+
+async def connect(host, port, unix):
+    """
+    Öffnet eine Verbindung zum Server.
+    """
+    if unix is not None:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+
+async def request(reader, writer, line):
+    """
+    Sendet einen Befehl und gibt die Felder der Antwort zurück (ohne 'ok').
+    """
+    writer.write((line + "\n").encode())
+    await writer.drain()
+    response = (await reader.readline()).decode().split()
+    if not response or response[0] != 'ok':
+        raise RuntimeError("Serverfehler: " + ' '.join(response))
+    return response[1:]
+
+
+async def client(host, port, unix, deadline, latencies, rng):
+    """
+    Spielt zufällige Partien, bis die Messdauer abgelaufen ist.
+
+    Rückgabe:
+        Anzahl der beendeten Partien.
+    """
+    reader, writer = await connect(host, port, unix)
+    games = 0
+    try:
+        while time.perf_counter() < deadline:
+            game_id = (await request(reader, writer, 'new'))[0]
+            heights = [0] * COLS
+            status = PLAYING
+            while status == PLAYING and time.perf_counter() < deadline:
+                col = rng.choice([c for c in range(COLS) if heights[c] < ROWS])
+                heights[col] += 1
+                start = time.perf_counter()
+                reply, status = await request(reader, writer, 'move ' + game_id + ' ' + str(col + 1))
+                latencies.append((time.perf_counter() - start) * 1000)
+                if reply != '-':
+                    heights[int(reply) - 1] += 1
+            await request(reader, writer, 'end ' + game_id)
+            games += status != PLAYING
+    finally:
+        writer.close()
+    return games
+
+
+async def run_level(games, seconds, host, port, unix, seed):
+    """
+    Misst eine Stufe mit games gleichzeitigen Partien.
+
+    Rückgabe:
+        Dictionary mit Partien, Zügen, Zügen pro Sekunde, p50 und p99 in ms.
+    """
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + seconds
+    finished = await asyncio.gather(*[client(host, port, unix, deadline, latencies,
+                                             random.Random(seed + i)) for i in range(games)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'games': games,
+        'finished': sum(finished),
+        'moves': len(latencies),
+        'moves_per_s': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Lasttest für server.py.')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP-Adresse')
+    parser.add_argument('--port', type=int, default=PORT, help='TCP-Port')
+    parser.add_argument('--unix', help='Pfad eines Unix-Sockets statt TCP')
+    parser.add_argument('--games', type=int, nargs='+', default=list(LEVELS),
+                        help='Stufen gleichzeitiger Partien')
+    parser.add_argument('--seconds', type=float, default=10, help='Messdauer je Stufe')
+    parser.add_argument('--seed', type=int, default=1, help='Startwert der Zufallszüge')
+    args = parser.parse_args(argv)
+
+    print('Partien  beendet   Züge   Züge/s   p50 ms   p99 ms')
+    for games in args.games:
+        r = asyncio.run(run_level(games, args.seconds, args.host, args.port, args.unix, args.seed))
+        print('%7d %8d %6d %8.1f %8.1f %8.1f' % (r['games'], r['finished'], r['moves'],
+                                                 r['moves_per_s'], r['p50_ms'], r['p99_ms']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
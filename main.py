@@ -1,37 +1,143 @@
-#!/sr/bin/env pybricks-micropython
-from pybricks.hubs import EV3Brick
-from pybricks.ev3devices import Motor, ColorSensor, TouchSensor
-from pybricks.parameters import Port
-from board_setup import calibrate_board, draw_board
-from game_logic import play_game
+#!/usr/bin/env pybricks-micropython
+from hardware import Hardware, Button, StopWatch, wait
+from board_setup import (prepare_board, draw_board, save_calibration, CALIBRATION_PATH,
+                         START_FULL, START_FAST, START_SHEET)
+from game_logic import play_game, Engine
+from book import OpeningBook, BOOK_PATH
+from record import GameRecorder, RECORD_PATH
 
+START_MENU_MS = 3000  # Wartezeit auf die Wahl des Startmodus
 
-# Initialisierung der Hardware-Komponenten
-ev3 = EV3Brick()  # EV3-Steuereinheit
-motor_a = Motor(Port.A)  # Motor A: Hebt und senkt den Stift
-motor_b = Motor(Port.B)  # Motor B: Bewegt das Blatt horizontal (X-Achse, invertiert)
-motor_c = Motor(Port.C)  # Motor C: Bewegt den Stift vertikal (Y-Achse)
-light_sensor = ColorSensor(Port.S3)  # Lichtsensor zur Kantenerkennung
-touch_sensor = TouchSensor(Port.S4)  # Berührungssensor für obere Kalibrierungsposition
 
-def main():
-    """
-Hauptfunktion des Programms.
-Steuert den Ablauf:
-    1. Signalton zum Programmstart
-2. Kalibrierung des Spielfelds
-3. Zeichnen des leeren Spielfelds
-4. Starten des Spiels
-5. Signalton zum Programmende
-"""
-ev3.speaker.beep()  # Signal, dass das Programm gestartet wurde
-# Kalibrierung durchführen und Spielfeldgrenzen ermitteln
-max_height, min_height, field_width = calibrate_board(motor_b, motor_c, light_sensor, touch_sensor)
-# Leeres Spielfeld zeichnen
-draw_board(motor_a, motor_b, motor_c, max_height, min_height, field_width)
-# Spiel starten
-play_game(motor_a, motor_b, motor_c, max_height, min_height, field_width)
-ev3.speaker.beep()  # Signal, dass das Programm beendet wurde
+# Initialisierung der Hardware-Komponenten (EV3 oder Simulation, siehe hardware.py)
+hw = Hardware()
+ev3 = hw.ev3  # EV3-Steuereinheit
+motor_a = hw.motor_a  # Motor A: Hebt und senkt den Stift
+motor_b = hw.motor_b  # Motor B: Bewegt das Blatt horizontal (X-Achse, invertiert)
+motor_c = hw.motor_c  # Motor C: Bewegt den Stift vertikal (Y-Achse)
+light_sensor = hw.light_sensor  # Lichtsensor zur Kantenerkennung
+touch_sensor = hw.touch_sensor  # Berührungssensor für obere Kalibrierungsposition
+
+def select_start_mode():
+    """
+    Lässt den Startmodus über die Tasten wählen:
+        links: Vollständige Kalibrierung und neues Spielfeld
+        rechts: Neues Spiel auf dem vorhandenen Blatt
+        keine Taste (START_MENU_MS): Gespeicherte Kalibrierung, neues Spielfeld
+    
+    Rückgabe:
+        START_FULL, START_FAST oder START_SHEET
+    """
+    ev3.screen.clear()
+    ev3.screen.draw_text(0, 10, "Links: neu kalibrieren")
+    ev3.screen.draw_text(0, 30, "Rechts: altes Blatt")
+    ev3.screen.draw_text(0, 50, "Warten: schnell")
+    watch = StopWatch()
+    while watch.time() < START_MENU_MS:
+        buttons = ev3.buttons.pressed()
+        if Button.LEFT in buttons:
+            return START_FULL
+        if Button.RIGHT in buttons:
+            return START_SHEET
+        wait(10)
+    return START_FAST
+
+def wait_for_next_game():
+    """
+    Wartet nach einem Spiel auf die Entscheidung des Spielers:
+        Mitte: Neues Blatt ist eingelegt, nächstes Spiel starten
+        unten: Sitzung beenden
+    
+    Rückgabe:
+        True für ein weiteres Spiel, sonst False.
+    """
+    ev3.screen.clear()
+    ev3.screen.draw_text(0, 10, "Neues Blatt: Mitte")
+    ev3.screen.draw_text(0, 30, "Ende: unten")
+    while True:
+        buttons = ev3.buttons.pressed()
+        if Button.CENTER in buttons:
+            while ev3.buttons.pressed():
+                wait(10)  # Loslassen abwarten, damit die Taste nicht als Spielzug zählt
+            return True
+        if Button.DOWN in buttons:
+            return False
+        wait(10)
+
+def session_summary(results):
+    """
+    Fasst die Ergebnisse einer Sitzung zusammen.
+    
+    Parameter:
+        results: Liste der Rückgabewerte von play_game
+        
+    Rückgabe:
+        Dictionary mit Anzahl der Spiele, Siegen je Seite, Remis und
+        mittlerer Spieldauer in ms.
+    """
+    summary = {'games': len(results), 'player': 0, 'ai': 0, 'draw': 0, 'mean_ms': 0}
+    for result in results:
+        summary[result['winner']] += 1
+        summary['mean_ms'] += result['duration_ms']
+    if results:
+        summary['mean_ms'] //= len(results)
+    return summary
+
+def main(mode=None, games=None):
+    """
+    Hauptfunktion des Programms.
+    Steuert den Ablauf einer Sitzung:
+        1. Signalton zum Programmstart
+        2. Wahl des Startmodus (falls nicht vorgegeben)
+        3. Kalibrierung des Spielfelds (gespeichert oder vollständig)
+        4. Zeichnen des leeren Spielfelds (außer auf vorhandenem Blatt)
+        5. Spiel; danach Parkposition speichern und auf ein neues Blatt
+           warten (Schritt 4), solange weitergespielt wird
+        6. Zusammenfassung der Sitzung und Signalton zum Programmende
+    
+    Hardware, Kalibrierung, Transpositionstabellen und Eröffnungsbuch bleiben
+    über alle Spiele der Sitzung erhalten; nur das Spielfeld wird neu angelegt.
+    
+    Parameter:
+        mode: Optionaler Startmodus (START_FULL, START_FAST, START_SHEET)
+        games: Optionale Höchstzahl an Spielen (sonst bis zur Taste unten)
+        
+    Rückgabe:
+        Liste der Ergebnisse je Spiel (siehe play_game).
+    """
+    ev3.speaker.beep()  # Signal, dass das Programm gestartet wurde
+    if mode is None:
+        mode = select_start_mode()
+    # Kalibrierung prüfen oder durchführen und Spielfeld vorbereiten
+    max_height, min_height, field_width = prepare_board(motor_a, motor_b, motor_c, light_sensor,
+                                                        touch_sensor, mode)
+    # Eröffnungsbuch öffnen (falls vorhanden); Suchtabellen für alle Spiele anlegen
+    book = OpeningBook.open(BOOK_PATH)
+    engine = Engine(book=book)
+    recorder = GameRecorder(RECORD_PATH)  # Jedes Spiel an das Spielprotokoll anhängen
+    results = []
+    while True:
+        result = play_game(motor_a, motor_b, motor_c, max_height, min_height, field_width,
+                           engine=engine, recorder=recorder)
+        results.append(result)
+        print("Spiel " + str(len(results)) + ": " + result['winner'] + ", "
+              + str(result['moves']) + " Halbzüge, " + str(result['duration_ms']) + " ms")
+        # Motorwinkel sichern, damit auch ein Abbruch zwischen zwei Spielen schnell neu startet
+        save_calibration(max_height, min_height, field_width, (motor_a, motor_b, motor_c),
+                         CALIBRATION_PATH)
+        if games is not None and len(results) >= games:
+            break
+        if not wait_for_next_game():
+            break
+        save_calibration(max_height, min_height, field_width, None, CALIBRATION_PATH)
+        draw_board(motor_a, motor_b, motor_c, max_height, min_height, field_width)
+    if book is not None:
+        book.close()
+    summary = session_summary(results)
+    print("Sitzung: " + str(summary['games']) + " Spiele, Spieler " + str(summary['player'])
+          + ", KI " + str(summary['ai']) + ", Remis " + str(summary['draw']))
+    ev3.speaker.beep()  # Signal, dass das Programm beendet wurde
+    return results
     
 if __name__ == "__main__":
     main()
@@ -0,0 +1,183 @@
+"""
+Bewegungsschicht für den Plotter.
+
+X-Achse (Motor B) und Y-Achse (Motor C) fahren ihre Ziele gleichzeitig an
+(nicht blockierende Befehle, anschließend wird auf beide gewartet).
+Geschwindigkeiten und Beschleunigung sind über ein MotionProfile
+einstellbar. Mit concurrent=False und serpentine=False verhält sich der
+Plotter wie vor Einführung dieser Schicht (Achsen nacheinander, jede Linie
+aus derselben Richtung), was Vergleichsmessungen der Zeichenzeit erlaubt.
+
+Ein DrawJob führt eine Zeichenfolge kooperativ aus: Jeder Schritt startet
+Motorbefehle ohne zu warten, poll() startet den nächsten Schritt erst, wenn
+die Motoren des vorherigen ihr Ziel erreicht haben. Dazwischen kann das
+Programm (z. B. die KI-Suche) weiterrechnen.
+"""
+from hardware import wait, StopWatch
+
+PEN_ANGLE = 180  # Drehwinkel von Motor A zum Absenken/Anheben des Stifts
+POLL_MS = 5  # Abfrageintervall beim Warten auf die Motoren
+
+
+class MotionProfile:
+    """
+    Geschwindigkeits- und Beschleunigungsprofil des Plotters.
+
+    Attribute:
+        travel_speed: Geschwindigkeit bei Leerfahrten (Stift oben), °/s
+        line_speed: Geschwindigkeit beim Zeichnen der Spielfeldlinien, °/s
+        mark_speed: Geschwindigkeit beim Zeichnen der Spielsteine, °/s
+        pen_speed: Geschwindigkeit von Motor A (Stift), °/s
+        acceleration: Beschleunigung in °/s² (None = Voreinstellung der Firmware)
+        concurrent: True, wenn X- und Y-Achse gleichzeitig fahren
+        serpentine: True, wenn Spielfeldlinien abwechselnd in beide Richtungen
+                    gezeichnet werden (kürzere Leerfahrten)
+    """
+
+    def __init__(self, travel_speed=600, line_speed=600, mark_speed=200, pen_speed=600,
+                 acceleration=None, concurrent=True, serpentine=True):
+        self.travel_speed = travel_speed
+        self.line_speed = line_speed
+        self.mark_speed = mark_speed
+        self.pen_speed = pen_speed
+        self.acceleration = acceleration
+        self.concurrent = concurrent
+        self.serpentine = serpentine
+
+
+DEFAULT_PROFILE = MotionProfile()  # Standardprofil
+SEQUENTIAL_PROFILE = MotionProfile(concurrent=False, serpentine=False)  # Altes Verhalten zum Vergleich
+
+
+def apply_profile(profile, *motors):
+    """
+    Überträgt die Beschleunigung des Profils auf die Regelung der Motoren.
+    """
+    if profile.acceleration is None:
+        return
+    for motor in motors:
+        speed, _, actuation = motor.control.limits()
+        motor.control.limits(speed, profile.acceleration, actuation)
+
+
+def join(*motors):
+    """
+    Wartet, bis alle Motoren ihr Ziel erreicht haben.
+    """
+    while True:
+        for motor in motors:
+            if not motor.control.done():
+                break
+        else:
+            return
+        wait(POLL_MS)
+
+
+def move_xy(motor_b, motor_c, x, y, speed, profile=DEFAULT_PROFILE):
+    """
+    Fährt den Stift zur absoluten Position (x, y).
+
+    Parameter:
+        motor_b: Motor für die X-Achse (Zielwinkel x)
+        motor_c: Motor für die Y-Achse (Zielwinkel y)
+        x: Zielwinkel von Motor B
+        y: Zielwinkel von Motor C
+        speed: Geschwindigkeit in °/s
+        profile: Bewegungsprofil
+    """
+    if profile.concurrent:
+        motor_b.run_target(speed, x, wait=False)
+        motor_c.run_target(speed, y, wait=False)
+        join(motor_b, motor_c)
+    else:
+        motor_b.run_target(speed, x)
+        motor_c.run_target(speed, y)
+
+
+def move_xy_steps(motor_b, motor_c, x, y, speed, profile=DEFAULT_PROFILE):
+    """
+    Schritte für einen DrawJob: fährt den Stift wie move_xy zur Position (x, y).
+    """
+    if profile.concurrent:
+        motor_b.run_target(speed, x, wait=False)
+        motor_c.run_target(speed, y, wait=False)
+        yield (motor_b, motor_c)
+    else:
+        motor_b.run_target(speed, x, wait=False)
+        yield (motor_b,)
+        motor_c.run_target(speed, y, wait=False)
+        yield (motor_c,)
+
+
+def pen_down(motor_a, profile=DEFAULT_PROFILE, speed=None, wait=True):
+    """
+    Senkt den Stift ab.
+
+    Rückgabe:
+        Die bewegten Motoren (als Schritt eines DrawJob mit wait=False).
+    """
+    motor_a.run_angle(speed or profile.pen_speed, -PEN_ANGLE, wait=wait)
+    return (motor_a,)
+
+
+def pen_up(motor_a, profile=DEFAULT_PROFILE, speed=None, wait=True):
+    """
+    Hebt den Stift an.
+
+    Rückgabe:
+        Die bewegten Motoren (als Schritt eines DrawJob mit wait=False).
+    """
+    motor_a.run_angle(speed or profile.pen_speed, PEN_ANGLE, wait=wait)
+    return (motor_a,)
+
+
+class DrawJob:
+    """
+    Kooperativ ausgeführte Zeichenfolge.
+
+    steps ist ein Generator, der je Schritt Motorbefehle mit wait=False
+    startet und die Motoren liefert, auf die vor dem nächsten Schritt
+    gewartet werden muss. Der erste Schritt startet sofort.
+
+    Attribute:
+        done: True, wenn alle Schritte ausgeführt sind
+        ms: Zeichenzeit in Millisekunden (gesetzt, sobald done True ist)
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.motors = ()
+        self.done = False
+        self.ms = 0
+        self.watch = StopWatch()
+        self.poll()
+
+    def poll(self):
+        """
+        Startet den nächsten Schritt, falls der aktuelle beendet ist, und
+        kehrt sofort zurück.
+
+        Rückgabe:
+            True, wenn die Zeichenfolge vollständig ausgeführt ist.
+        """
+        while not self.done:
+            for motor in self.motors:
+                if not motor.control.done():
+                    return False
+            try:
+                self.motors = next(self.steps)
+            except StopIteration:
+                self.done = True
+                self.ms = self.watch.time()
+        return True
+
+    def finish(self):
+        """
+        Führt die restlichen Schritte blockierend aus.
+
+        Rückgabe:
+            Die Zeichenzeit in Millisekunden.
+        """
+        while not self.poll():
+            wait(POLL_MS)
+        return self.ms
@@ -0,0 +1,131 @@
+"""
+Zugsortierung für die Minimax-Suche.
+
+Reihenfolge der Züge an einem Knoten:
+    1. Zug aus der Transpositionstabelle bzw. der vorherigen Iteration
+    2. Killer-Züge (haben auf derselben Ebene zuletzt einen Cutoff erzeugt)
+    3. Übrige Züge nach History-Wert, bei Gleichstand von der Mitte nach außen
+"""
+
+ROWS = 6  # Anzahl der Zeilen
+COLS = 7  # Anzahl der Spalten
+
+# Statische Reihenfolge: mittlere Spalten zuerst
+CENTER_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+
+
+class MoveOrdering:
+    """
+    Zugsortierung mit Killer- und History-Heuristik.
+
+    Attribute:
+        enabled: False liefert die ursprüngliche Reihenfolge 0..COLS-1
+                 (zum Vergleich der Knotenzahl)
+        killers: Zwei Killer-Züge je Anzahl gespielter Steine
+        history: History-Werte je Spieler und Spalte
+        buffers: Zugpuffer je Anzahl gespielter Steine (siehe fill)
+        nodes: Anzahl der sortierten (inneren) Knoten
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.killers = [[-1, -1] for _ in range(ROWS * COLS + 1)]
+        self.history = [[0] * COLS, [0] * COLS]
+        self.buffers = [[0] * COLS for _ in range(ROWS * COLS + 1)]
+        self.nodes = 0
+
+    def new_search(self):
+        """
+        Halbiert die History-Werte zu Beginn eines neuen KI-Zuges, damit
+        ältere Erfahrungen an Gewicht verlieren.
+        """
+        for table in self.history:
+            for col in range(COLS):
+                table[col] >>= 1
+
+    def fill(self, board, player, hint=None):
+        """
+        Schreibt die gültigen Spalten in Suchreihenfolge in den vorab
+        angelegten Puffer der aktuellen Ebene (buffers[board.moves]).
+        Es wird kein neues Objekt angelegt.
+
+        Parameter:
+            board: Das Spielfeld (Position)
+            player: Spielerindex, der am Zug ist
+            hint: Optionaler Zug, der zuerst durchsucht werden soll
+
+        Rückgabe:
+            Anzahl der gültigen Spalten im Puffer.
+        """
+        self.nodes += 1
+        heights = board.heights
+        buffer = self.buffers[board.moves]
+        n = 0
+        if not self.enabled:
+            if hint is not None and heights[hint] < ROWS:
+                buffer[0] = hint
+                n = 1
+            for col in range(COLS):
+                if heights[col] < ROWS and col != hint:
+                    buffer[n] = col
+                    n += 1
+            return n
+
+        killers = self.killers[board.moves]
+        k0 = killers[0]
+        k1 = killers[1]
+        history = self.history[player]
+        # Einfügesortierung: TT-Zug, Killer-Züge, dann nach History-Wert;
+        # bei Gleichstand entscheidet die statische Reihenfolge
+        for i in range(COLS):
+            col = CENTER_ORDER[i]
+            if heights[col] >= ROWS:
+                continue
+            tier = 2 if col == hint else (1 if col == k0 or col == k1 else 0)
+            score = history[col]
+            j = n
+            while j > 0:
+                prev = buffer[j - 1]
+                prev_tier = 2 if prev == hint else (1 if prev == k0 or prev == k1 else 0)
+                if prev_tier > tier or (prev_tier == tier and history[prev] >= score):
+                    break
+                buffer[j] = prev
+                j -= 1
+            buffer[j] = col
+            n += 1
+        return n
+
+    def order(self, board, player, hint=None):
+        """
+        Gibt die gültigen Spalten in Suchreihenfolge als neue Liste zurück
+        (für Aufrufer außerhalb der Suche, siehe fill).
+
+        Parameter:
+            board: Das Spielfeld (Position)
+            player: Spielerindex, der am Zug ist
+            hint: Optionaler Zug, der zuerst durchsucht werden soll
+
+        Rückgabe:
+            Liste der Spaltenindizes.
+        """
+        n = self.fill(board, player, hint)
+        return self.buffers[board.moves][:n]
+
+    def cutoff(self, board, player, col, depth):
+        """
+        Merkt sich einen Zug, der einen Alpha- oder Beta-Cutoff erzeugt hat.
+
+        Parameter:
+            board: Das Spielfeld (Position vor dem Zug)
+            player: Spielerindex, der gezogen hat
+            col: Die Spalte des Zuges
+            depth: Verbleibende Suchtiefe am Knoten
+        """
+        if not self.enabled:
+            return
+        killers = self.killers[board.moves]
+        if killers[0] != col:
+            killers[1] = killers[0]
+            killers[0] = col
+        self.history[player][col] += depth * depth
@@ -0,0 +1,181 @@
+"""
+Parallele Wurzelsuche für die Analyse auf dem Host (nicht für den EV3).
+
+Die Züge an der Wurzel werden auf einen multiprocessing-Pool verteilt
+(Young Brothers Wait an der Wurzel: der erste Zug wird allein durchsucht,
+danach laufen die übrigen parallel). Jeder Worker hat eine eigene
+Transpositionstabelle und Zugsortierung. Die bisher beste Wurzelbewertung
+liegt in einem gemeinsamen Wert und verengt das Suchfenster der übrigen
+Worker.
+
+Das Ergebnis ist identisch mit der seriellen Suche
+minimax(board, depth, -inf, inf, maximizingPlayer, TranspositionTable(),
+None, None, MoveOrdering()): Die Worker suchen mit einem um 1 erweiterten
+Fenster, sodass jeder Zug, der die beste Bewertung erreicht, exakt bewertet
+wird, und bei Gleichstand gewinnt wie seriell der erste Zug der
+Wurzelreihenfolge. Sofortige Gewinne und Drohungen werden an der Wurzel
+wie in der seriellen Suche behandelt (siehe game_logic.prune_threats).
+"""
+import multiprocessing
+
+from game_logic import (minimax, board_to_grid, grid_to_board, get_valid_locations, is_terminal_node,
+                        winning_column, prune_threats, PIECE_INDEX, AI, PLAYER, WIN_SCORE, LOSS_SCORE)
+from transposition import TranspositionTable, TT_SIZE
+from ordering import MoveOrdering
+
+INF = float('inf')
+
+# Zustand je Worker-Prozess (über _init_worker gesetzt)
+_bound = None
+_tt = None
+_ordering = None
+_search_id = None
+
+
+def _init_worker(bound, tt_size, move_ordering):
+    """
+    Initialisiert einen Worker mit dem gemeinsamen Schrankenwert und einer
+    eigenen Transpositionstabelle.
+    """
+    global _bound, _tt, _ordering
+    _bound = bound
+    _tt = TranspositionTable(tt_size)
+    _ordering = MoveOrdering() if move_ordering else None
+
+
+def _search_root_move(task):
+    """
+    Durchsucht einen Wurzelzug in einem Worker.
+
+    Parameter:
+        task: Tuple (Such-ID, 2D-Array der Stellung, Spalte, Tiefe, maximierend)
+
+    Rückgabe:
+        Tuple (Spalte, Bewertung, exakt): exakt ist False, wenn die Bewertung
+        nur eine Schranke ist (der Zug ist dann sicher schlechter als der beste).
+    """
+    global _search_id, _ordering
+    search_id, grid, col, depth, maximizing = task
+    if search_id != _search_id:
+        # Neue Suche: Tabelle leeren, damit das Ergebnis der seriellen Suche entspricht
+        _search_id = search_id
+        _tt.clear()
+        if _ordering is not None:
+            _ordering = MoveOrdering()
+    board = grid_to_board(grid)
+    piece = AI if maximizing else PLAYER
+    board.play(col, PIECE_INDEX[piece])
+
+    bound = _bound.value
+    if maximizing:
+        alpha = bound - 1 if bound != -INF else -INF
+        value = minimax(board, depth - 1, alpha, INF, False, _tt, None, None, _ordering)[1]
+        exact = value > alpha
+        if exact:
+            with _bound.get_lock():
+                if value > _bound.value:
+                    _bound.value = value
+    else:
+        beta = bound + 1 if bound != INF else INF
+        value = minimax(board, depth - 1, -INF, beta, True, _tt, None, None, _ordering)[1]
+        exact = value < beta
+        if exact:
+            with _bound.get_lock():
+                if value < _bound.value:
+                    _bound.value = value
+    return col, value, exact
+
+
+class ParallelSearcher:
+    """
+    Wurzelparallele Minimax-Suche über einen Prozess-Pool.
+
+    Verwendung:
+        with ParallelSearcher(workers=4) as searcher:
+            col, value = searcher.search(board, 8, True)
+
+    Parameter:
+        workers: Anzahl der Prozesse (Standard: Anzahl der CPUs)
+        tt_size: Größe der Transpositionstabelle je Worker
+        move_ordering: False durchsucht wie minimax ohne MoveOrdering von
+                       links nach rechts
+    """
+
+    def __init__(self, workers=None, tt_size=TT_SIZE * 16, move_ordering=True):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.move_ordering = move_ordering
+        self.bound = multiprocessing.Value('d', -INF)
+        self.pool = multiprocessing.Pool(self.workers, _init_worker,
+                                         (self.bound, tt_size, move_ordering))
+        self.searches = 0
+
+    def close(self):
+        """
+        Beendet den Pool.
+        """
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def search(self, board, depth, maximizingPlayer):
+        """
+        Sucht den besten Zug.
+
+        Parameter:
+            board: Das Spielfeld
+            depth: Suchtiefe
+            maximizingPlayer: True, wenn die KI am Zug ist
+
+        Rückgabe:
+            Tuple (Spalte, Bewertung) wie minimax.
+        """
+        if depth == 0 or is_terminal_node(board):
+            return minimax(board, depth, -INF, INF, maximizingPlayer)
+        player = PIECE_INDEX[AI] if maximizingPlayer else PIECE_INDEX[PLAYER]
+        col = winning_column(board, player)
+        if col is not None:
+            return col, WIN_SCORE if maximizingPlayer else LOSS_SCORE
+        if self.move_ordering:
+            root_order = MoveOrdering().order(board, player)  # Wie die serielle Suche
+        else:
+            root_order = get_valid_locations(board)
+        del root_order[prune_threats(board, player, root_order, len(root_order)):]
+        grid = board_to_grid(board)
+        self.searches += 1
+        self.bound.value = -INF if maximizingPlayer else INF
+        tasks = [(self.searches, grid, col, depth, maximizingPlayer) for col in root_order]
+
+        # Young Brothers Wait: erster Zug allein, liefert die Startschranke
+        results = {}
+        col, value, exact = self.pool.apply(_search_root_move, (tasks[0],))
+        results[col] = (value, exact)
+        for col, value, exact in self.pool.imap_unordered(_search_root_move, tasks[1:]):
+            results[col] = (value, exact)
+
+        # Bester exakt bewerteter Zug, bei Gleichstand der erste der Wurzelreihenfolge
+        best_col = None
+        best_value = None
+        for col in root_order:
+            value, exact = results[col]
+            if not exact:
+                continue
+            if best_col is None or (value > best_value if maximizingPlayer else value < best_value):
+                best_col = col
+                best_value = value
+        return best_col, best_value
+
+
+def parallel_minimax(board, depth, maximizingPlayer, workers=None, move_ordering=True):
+    """
+    Einmalige wurzelparallele Suche (erstellt und beendet einen eigenen Pool).
+
+    Rückgabe:
+        Tuple (Spalte, Bewertung) wie minimax.
+    """
+    with ParallelSearcher(workers, move_ordering=move_ordering) as searcher:
+        return searcher.search(board, depth, maximizingPlayer)
@@ -0,0 +1,102 @@
+"""
+Pondern: Suche auf Kosten der Bedenkzeit des Spielers.
+
+Während der Spieler seine Spalte über die EV3-Tasten wählt, durchsucht der
+Ponderer zwischen zwei Tastenabfragen die möglichen Antworten des Spielers
+(kooperativ, in kurzen Zeitscheiben). Die Ergebnisse landen in der
+Transpositionstabelle und in einem Antwort-Cache, sodass die KI nach der
+Eingabe oft sofort ziehen kann.
+"""
+from timing import SearchTimer, SearchTimeout
+
+PONDER_SLICE_MS = 50  # Maximale Rechenzeit pro Schritt zwischen zwei Tastenabfragen
+PONDER_MAX_DEPTH = 12  # Tiefer wird eine Antwort nicht vorausberechnet
+PONDER_INSTANT_DEPTH = 6  # Ab dieser Tiefe wird das Ergebnis ohne neue Suche gespielt
+
+CENTER_ORDER = (3, 2, 4, 1, 5, 0, 6)  # Wahrscheinliche Antworten zuerst
+
+
+class Ponderer:
+    """
+    Durchsucht die Stellungen nach jeder möglichen Antwort des Gegners
+    schrittweise mit wachsender Tiefe.
+
+    Attribute:
+        results: Antwort-Cache, Zobrist-Hash -> (Spalte, Bewertung, Tiefe)
+        steps: Anzahl der ausgeführten Schritte
+    """
+
+    def __init__(self, board, player, search, slice_ms=PONDER_SLICE_MS,
+                 max_depth=PONDER_MAX_DEPTH):
+        """
+        Parameter:
+            board: Das Spielfeld, auf dem der Gegner am Zug ist
+            player: Spielerindex des Gegners
+            search: Suchfunktion search(position, depth, timer, first) -> (Spalte, Bewertung)
+            slice_ms: Zeitscheibe pro Schritt in Millisekunden
+            max_depth: Maximale Suchtiefe je Antwort
+        """
+        self.search = search
+        self.slice_ms = slice_ms
+        self.max_depth = max_depth
+        self.positions = []  # Stellung nach jeder Antwort
+        self.depths = []  # Abgeschlossene Tiefe je Antwort
+        self.best = []  # Bester Zug der letzten Iteration je Antwort
+        self.results = {}
+        self.next = 0
+        self.steps = 0
+        for col in CENTER_ORDER:
+            if not board.can_play(col):
+                continue
+            pos = board.copy()
+            pos.play(col, player)
+            if pos.is_win(player) or pos.is_full():
+                continue  # Nach dieser Antwort ist das Spiel vorbei
+            self.positions.append(pos)
+            self.depths.append(0)
+            self.best.append(None)
+
+    def done(self):
+        """
+        True, wenn alle Antworten bis zur Maximaltiefe durchsucht sind.
+        """
+        for depth in self.depths:
+            if depth < self.max_depth:
+                return False
+        return True
+
+    def step(self):
+        """
+        Führt einen Suchschritt aus (höchstens etwa slice_ms lang).
+        Durchsucht wird die Antwort mit der bisher geringsten Tiefe.
+        """
+        count = len(self.positions)
+        if count == 0 or self.done():
+            return
+        # Antwort mit der geringsten Tiefe, ab self.next im Kreis gesucht
+        index = self.next % count
+        for k in range(count):
+            i = (self.next + k) % count
+            if self.depths[i] < self.depths[index]:
+                index = i
+        self.next = index + 1
+        self.steps += 1
+
+        depth = self.depths[index] + 1
+        pos = self.positions[index].copy()  # Bei Zeitablauf bleibt die Stellung unverändert
+        try:
+            col, value = self.search(pos, depth, SearchTimer(self.slice_ms), self.best[index])
+        except SearchTimeout:
+            return  # Teilergebnisse stehen in der Transpositionstabelle
+        self.depths[index] = depth
+        self.best[index] = col
+        self.results[pos.hash] = (col, value, depth)
+
+    def lookup(self, board):
+        """
+        Gibt das vorausberechnete Ergebnis für die aktuelle Stellung zurück.
+
+        Rückgabe:
+            Tuple (Spalte, Bewertung, Tiefe) oder None.
+        """
+        return self.results.get(board.hash)
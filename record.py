@@ -0,0 +1,334 @@
+"""
+Spielprotokoll, Wiedergabe und Stellungsindex.
+
+Jedes Spiel wird als eine Textzeile an die Protokolldatei angehängt; die
+Spielnummer ist die Zeilennummer (ab 0). Aufbau einer Zeile (durch
+Leerzeichen getrennt):
+
+    Ergebnis  Züge  Zeiten  Suche
+
+    Ergebnis: X (Spieler), O (KI) oder = (Remis)
+    Züge:     Spalten 1..7 in Spielreihenfolge, z. B. 4453 (- für kein Zug)
+    Zeiten:   Bedenkzeit je Halbzug in ms, durch Kommas getrennt
+    Suche:    je Halbzug durch Kommas getrennt; . für Spielerzüge, für
+              KI-Züge die Quelle (b Buch, l Löser, p Ponder, s Suche,
+              t erzwungener Zug),
+              gefolgt von der Tiefe und, falls gezählt, :Knoten
+
+Beispiel:
+    O 4453 2100,12,3300,2950 .,b,.,s9:48211
+
+Der Index (nur auf dem Host) ordnet jedem Positionsschlüssel die Spiele und
+Halbzüge zu, in denen die Stellung vorkam. Er liegt wie das Eröffnungsbuch
+als sortierte Binärdatei vor (12 Byte je Eintrag, gespiegelte Stellungen
+zusammengefasst) und wird per binärer Suche abgefragt.
+
+Aufruf (Host):
+    python record.py replay games.log --game 12 --ply 10
+    python record.py index games.log --out games.idx
+    python record.py query games.log games.idx 4453
+"""
+import struct
+
+from book import book_key
+from game_logic import create_board, show_board
+
+RECORD_PATH = 'games.log'  # Standardpfad des Spielprotokolls
+INDEX_RECORD_SIZE = 12  # Bytes pro Indexeintrag
+RESULT_CODES = {'player': 'X', 'ai': 'O', 'draw': '='}
+SOURCE_CODES = {'book': 'b', 'solver': 'l', 'ponder': 'p', 'search': 's', 'threat': 't'}
+
+
+class GameRecorder:
+    """
+    Sammelt die Züge eines Spiels und hängt sie bei Spielende als Zeile an
+    die Protokolldatei an. Wird play_game als recorder übergeben.
+
+    Attribute:
+        path: Pfad der Protokolldatei
+        moves, times, search: Daten des laufenden Spiels
+    """
+
+    def __init__(self, path=RECORD_PATH):
+        self.path = path
+        self.begin()
+
+    def begin(self):
+        """
+        Beginnt ein neues Spiel.
+        """
+        self.moves = []
+        self.times = []
+        self.search = []
+
+    def move(self, col, ms, source=None, depth=0, nodes=None):
+        """
+        Merkt sich einen Halbzug.
+
+        Parameter:
+            col: Gespielte Spalte (0..6)
+            ms: Bedenkzeit in Millisekunden
+            source: Quelle eines KI-Zuges ('book', 'solver', 'ponder', 'search',
+                    'threat');
+                    None für Spielerzüge
+            depth: Suchtiefe des KI-Zuges
+            nodes: Optionale Knotenzahl der Suche
+        """
+        self.moves.append(str(col + 1))
+        self.times.append(str(ms))
+        if source is None:
+            self.search.append('.')
+        else:
+            entry = SOURCE_CODES[source] + (str(depth) if depth else '')
+            if nodes is not None:
+                entry += ':' + str(nodes)
+            self.search.append(entry)
+
+    def finish(self, winner):
+        """
+        Schreibt das Spiel in die Protokolldatei.
+
+        Parameter:
+            winner: 'player', 'ai' oder 'draw'
+        """
+        if self.moves:
+            line = (RESULT_CODES[winner] + ' ' + ''.join(self.moves) + ' '
+                    + ','.join(self.times) + ' ' + ','.join(self.search))
+        else:
+            line = RESULT_CODES[winner] + ' - - -'
+        try:
+            with open(self.path, 'a') as f:
+                f.write(line + "\n")
+        except OSError:
+            print("Spielprotokoll konnte nicht geschrieben werden")
+        self.begin()
+
+
+def parse_game(line):
+    """
+    Zerlegt eine Protokollzeile.
+
+    Rückgabe:
+        Dictionary mit winner, moves (Spalten 0..6), times und search.
+    """
+    result, moves, times, search = line.split()
+    winners = {code: name for name, code in RESULT_CODES.items()}
+    if moves == '-':
+        return {'winner': winners[result], 'moves': [], 'times': [], 'search': []}
+    return {
+        'winner': winners[result],
+        'moves': [int(m) - 1 for m in moves],
+        'times': [int(t) for t in times.split(',')],
+        'search': search.split(','),
+    }
+
+
+def read_games(path=RECORD_PATH):
+    """
+    Liefert (Spielnummer, Spiel) für alle Zeilen der Protokolldatei, ohne
+    die Datei vollständig zu laden.
+    """
+    with open(path) as f:
+        for number, line in enumerate(f):
+            if line.strip():
+                yield number, parse_game(line)
+
+
+def read_game(path, number):
+    """
+    Liest ein einzelnes Spiel aus der Protokolldatei.
+    """
+    for n, game in read_games(path):
+        if n == number:
+            return game
+    raise IndexError("Spiel " + str(number) + " nicht gefunden")
+
+
+def positions(game):
+    """
+    Spielt ein Spiel nach und liefert die Stellung vor jedem Halbzug und
+    nach dem letzten (immer dasselbe, fortgeschriebene Objekt). Spieler und
+    KI ziehen abwechselnd, der Spieler beginnt.
+
+    Löst ValueError aus, wenn die Zugfolge so nicht gespielt worden sein
+    kann (volle Spalte, Zug nach Spielende oder zwei Züge derselben Seite).
+    """
+    board = create_board()
+    yield board
+    for ply, col in enumerate(game['moves']):
+        if not board.can_play(col):
+            raise ValueError("Halbzug " + str(ply + 1) + ": Spalte " + str(col + 1) + " ist voll")
+        if board.is_win(0) or board.is_win(1):
+            raise ValueError("Halbzug " + str(ply + 1) + " nach Spielende")
+        if (game['search'][ply] == '.') != (ply % 2 == 0):
+            raise ValueError("Halbzug " + str(ply + 1) + ": Spieler und KI ziehen nicht abwechselnd")
+        board.play(col, ply % 2)
+        yield board
+
+
+def replay(game, ply=None):
+    """
+    Baut die Stellung nach ply Halbzügen eines Spiels auf (ohne Suche).
+
+    Parameter:
+        game: Ergebnis von parse_game
+        ply: Anzahl der Halbzüge (Standard: Spielende)
+
+    Rückgabe:
+        Die Position.
+
+    Löst ValueError bei einer unmöglichen Zugfolge aus (siehe positions).
+    """
+    for board in positions(game):
+        if board.moves == ply:
+            break
+    return board
+
+
+def pack_index_record(key, game, ply, mirrored):
+    """
+    Kodiert einen Indexeintrag als 12 Byte (Schlüssel, Halbzug, Spiel).
+    """
+    low = (ply | 0x80) if mirrored else ply
+    return struct.pack('>III', key >> 24, ((key & 0xFFFFFF) << 8) | low, game)
+
+
+def unpack_index_record(data):
+    """
+    Dekodiert einen Indexeintrag.
+
+    Rückgabe:
+        Tuple (Schlüssel, Spiel, Halbzug, gespiegelt).
+    """
+    hi, lo, game = struct.unpack('>III', data)
+    return (hi << 24) | (lo >> 8), game, lo & 0x7F, bool(lo & 0x80)
+
+
+def build_index(log_path, index_path):
+    """
+    Erzeugt den Stellungsindex zu einer Protokolldatei (nur auf dem Host).
+    Spiele mit unmöglicher Zugfolge werden übersprungen.
+
+    Rückgabe:
+        Anzahl der Indexeinträge.
+    """
+    entries = []
+    for number, game in read_games(log_path):
+        game_entries = []
+        try:
+            for board in positions(game):
+                key, mirrored = book_key(board)
+                game_entries.append(pack_index_record(key, number, board.moves, mirrored))
+        except ValueError as e:
+            print("Spiel " + str(number) + " übersprungen: " + str(e))
+            continue
+        entries.extend(game_entries)
+    entries.sort()  # Big Endian: Bytefolge sortiert nach Schlüssel
+    with open(index_path, 'wb') as f:
+        for entry in entries:
+            f.write(entry)
+    return len(entries)
+
+
+class PositionIndex:
+    """
+    Abfrage des Stellungsindex per binärer Suche in der Datei.
+
+    Attribute:
+        count: Anzahl der Einträge
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.file.seek(0, 2)
+        self.count = self.file.tell() // INDEX_RECORD_SIZE
+
+    def close(self):
+        """
+        Schließt die Indexdatei.
+        """
+        self.file.close()
+
+    def _read(self, index):
+        """
+        Liest den Eintrag mit dem gegebenen Index.
+        """
+        self.file.seek(index * INDEX_RECORD_SIZE)
+        return unpack_index_record(self.file.read(INDEX_RECORD_SIZE))
+
+    def lookup(self, board):
+        """
+        Sucht alle Vorkommen einer Stellung (auch gespiegelt).
+
+        Rückgabe:
+            Liste von Tupeln (Spiel, Halbzug, gespiegelt); gespiegelt ist
+            True, wenn die Stellung im Spiel spiegelverkehrt vorkam.
+        """
+        key, mirrored = book_key(board)
+        # Erster Eintrag mit passendem Schlüssel
+        low = 0
+        high = self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._read(mid)[0] < key:
+                low = mid + 1
+            else:
+                high = mid
+        found = []
+        while low < self.count:
+            entry_key, game, ply, entry_mirrored = self._read(low)
+            if entry_key != key:
+                break
+            found.append((game, ply, entry_mirrored != mirrored))
+            low += 1
+        return found
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Spielprotokoll wiedergeben und durchsuchen.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    p = commands.add_parser('replay', help='Stellung eines Spiels anzeigen')
+    p.add_argument('log', help='Protokolldatei')
+    p.add_argument('--game', type=int, default=0, help='Spielnummer (ab 0)')
+    p.add_argument('--ply', type=int, help='Halbzug (Standard: Spielende)')
+    p = commands.add_parser('index', help='Stellungsindex erzeugen')
+    p.add_argument('log', help='Protokolldatei')
+    p.add_argument('--out', default='games.idx', help='Indexdatei')
+    p = commands.add_parser('query', help='Spiele zu einer Stellung suchen')
+    p.add_argument('log', help='Protokolldatei')
+    p.add_argument('index', help='Indexdatei')
+    p.add_argument('moves', help="Zugfolge (Spalten 1..7, '-' für die Startstellung)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'replay':
+        game = read_game(args.log, args.game)
+        try:
+            board = replay(game, args.ply)
+        except ValueError as e:
+            print("Spiel " + str(args.game) + ": " + str(e))
+            return 1
+        show_board(board)
+        ply = board.moves
+        print("Spiel " + str(args.game) + ", Halbzug " + str(ply) + " von "
+              + str(len(game['moves'])) + ", Ergebnis: " + game['winner'])
+        if 0 < ply <= len(game['moves']):
+            print("Letzter Zug: Spalte " + str(game['moves'][ply - 1] + 1) + ", "
+                  + str(game['times'][ply - 1]) + " ms, " + game['search'][ply - 1])
+    elif args.command == 'index':
+        print(str(build_index(args.log, args.out)) + " Einträge")
+    else:
+        board = create_board()
+        for m in ('' if args.moves == '-' else args.moves):
+            board.play(int(m) - 1, board.moves % 2)
+        index = PositionIndex(args.index)
+        for game, ply, mirrored in index.lookup(board):
+            print("Spiel " + str(game) + ", Halbzug " + str(ply) + (" (gespiegelt)" if mirrored else ""))
+        index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
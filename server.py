@@ -0,0 +1,324 @@
+"""
+Spielserver für viele gleichzeitige Partien gegen die KI (nur auf dem Host).
+
+Der Server lauscht mit asyncio auf einem TCP- oder Unix-Socket. Jede
+Partie liegt in einem eigenen GameSession-Objekt; die Suchen der KI laufen
+in einem Prozess-Pool, damit lange Suchen die Ereignisschleife nicht
+blockieren. Höchstens --queue Suchen sind gleichzeitig im Pool, weitere
+Züge warten im Server.
+
+Protokoll (eine Zeile je Befehl, eine Zeile je Antwort, Spalten 1..7):
+    new                -> ok <id>
+    move <id> <spalte> -> ok <antwort> <status>
+                          antwort: Spalte der KI oder '-', wenn das Spiel
+                          schon mit dem Zug des Spielers endet
+    state <id>         -> ok <züge> <status>  (züge wie in analyse.py, '-' leer)
+    end <id>           -> ok
+    Fehler             -> err <meldung>
+Partien gehören zur Verbindung, auf der sie mit new angelegt wurden, und
+werden beim Schließen der Verbindung verworfen.
+Status: play (läuft), player (Spieler gewinnt), ai (KI gewinnt), draw.
+Der Spieler beginnt wie in play_game.
+
+Aufruf:
+    python server.py --port 7777 --workers 4 --time-ms 200
+    python server.py --unix /tmp/connect4.sock --depth 6
+"""
+import asyncio
+import concurrent.futures
+import itertools
+import multiprocessing
+import sys
+
+from analyse import parse_position
+from game_logic import (create_board, iterative_deepening, minimax, forced_move, is_valid_location,
+                        ROWS, COLS, AI_INDEX, PLAYER_INDEX, NEG_INF, INF)
+from transposition import TranspositionTable, TT_SIZE
+from ordering import MoveOrdering
+from solver import solve, SOLVER_EMPTY_CELLS, SOLVER_TT_SIZE
+
+PORT = 7777  # Standard-TCP-Port
+TIME_MS = 200  # Standard-Zeitbudget je KI-Zug
+QUEUE_PER_WORKER = 2  # Gleichzeitig an den Pool übergebene Suchen je Worker
+
+PLAYING = 'play'
+STATUS_PLAYER = 'player'
+STATUS_AI = 'ai'
+STATUS_DRAW = 'draw'
+
+# Zustand je Worker-Prozess (über _init_worker gesetzt)
+_tt = None
+_solver_tt = None
+_ordering = None
+
+
+def _init_worker(tt_size):
+    """
+    Legt die Suchtabellen eines Workers an. Sie gelten für alle Partien,
+    deren Züge der Worker berechnet (die Einträge hängen nur von der
+    Stellung ab).
+    """
+    global _tt, _solver_tt, _ordering
+    _tt = TranspositionTable(tt_size)
+    _solver_tt = TranspositionTable(SOLVER_TT_SIZE)
+    _ordering = MoveOrdering()
+
+
+def engine_move(moves, time_ms=TIME_MS, depth=None):
+    """
+    Berechnet den Zug der KI (läuft im Worker).
+
+    Parameter:
+        moves: Bisherige Zugfolge (Spalten 1..7, '-' für die Startstellung)
+        time_ms: Zeitbudget der iterativen Vertiefung
+        depth: Optionale feste Suchtiefe statt Zeitbudget
+
+    Rückgabe:
+        Die Spalte (0..6).
+    """
+    board = parse_position(moves)
+    col = forced_move(board, AI_INDEX)  # Gewinn oder Block steht ohne Suche fest
+    if col is not None:
+        return col
+    if ROWS * COLS - board.moves < SOLVER_EMPTY_CELLS:
+        return solve(board, AI_INDEX, _solver_tt)[0]
+    _tt.new_search()
+    _ordering.new_search()
+    if depth is not None:
+        return minimax(board, depth, NEG_INF, INF, True, _tt, None, None, _ordering)[0]
+    return iterative_deepening(board, time_ms, _tt, None, _ordering)[0]
+
+
+class GameSession:
+    """
+    Zustand einer Partie auf dem Server.
+
+    Attribute:
+        id: Spielnummer
+        board: Die Position
+        moves: Zugfolge als Zeichenkette (Spalten 1..7)
+        status: PLAYING, STATUS_PLAYER, STATUS_AI oder STATUS_DRAW
+        lock: Verhindert, dass zwei Züge derselben Partie gleichzeitig laufen
+    """
+
+    def __init__(self, game_id):
+        self.id = game_id
+        self.board = create_board()
+        self.moves = ''
+        self.status = PLAYING
+        self.lock = asyncio.Lock()
+
+    def play(self, col, player):
+        """
+        Setzt einen Stein und aktualisiert den Status.
+        """
+        self.board.play(col, player)
+        self.moves += str(col + 1)
+        if self.board.is_win(player):
+            self.status = STATUS_PLAYER if player == PLAYER_INDEX else STATUS_AI
+        elif self.board.is_full():
+            self.status = STATUS_DRAW
+
+    def undo(self, col, player):
+        """
+        Nimmt den letzten Stein zurück (Partie lief vor dem Zug noch).
+        """
+        self.board.undo(col, player)
+        self.moves = self.moves[:-1]
+        self.status = PLAYING
+
+
+class GameServer:
+    """
+    Verwaltet die Partien und den Prozess-Pool für die Suchen.
+
+    Parameter:
+        workers: Anzahl der Prozesse (Standard: Anzahl der CPUs)
+        time_ms: Zeitbudget je KI-Zug
+        depth: Optionale feste Suchtiefe statt Zeitbudget
+        queue: Maximal gleichzeitig an den Pool übergebene Suchen
+        tt_size: Größe der Transpositionstabelle je Worker
+    """
+
+    def __init__(self, workers=None, time_ms=TIME_MS, depth=None, queue=None,
+                 tt_size=TT_SIZE * 16):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.time_ms = time_ms
+        self.depth = depth
+        self.tt_size = tt_size
+        self.pool = self._new_pool()
+        self.slots = asyncio.Semaphore(queue or self.workers * QUEUE_PER_WORKER)
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.searches = 0
+
+    def _new_pool(self):
+        """
+        Legt den Prozess-Pool an. spawn statt fork: Worker erben sonst die
+        offenen Sockets der Verbindungen, und geschlossene Verbindungen
+        blieben für den Client offen.
+        """
+        return concurrent.futures.ProcessPoolExecutor(self.workers, multiprocessing.get_context('spawn'),
+                                                      _init_worker, (self.tt_size,))
+
+    def close(self):
+        """
+        Beendet den Prozess-Pool.
+        """
+        self.pool.shutdown(cancel_futures=True)
+
+    def session(self, text, owned):
+        """
+        Sucht eine Partie der Verbindung anhand ihrer Nummer (löst ValueError
+        aus). Partien anderer Verbindungen gelten als unbekannt.
+        """
+        try:
+            game_id = int(text)
+        except ValueError:
+            raise ValueError("unbekanntes Spiel " + text)
+        if game_id not in owned or game_id not in self.sessions:
+            raise ValueError("unbekanntes Spiel " + text)
+        return self.sessions[game_id]
+
+    async def search(self, moves):
+        """
+        Berechnet den KI-Zug im Pool, ohne die Ereignisschleife zu blockieren.
+        """
+        async with self.slots:
+            self.searches += 1
+            loop = asyncio.get_running_loop()
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(pool, engine_move, moves or '-',
+                                                  self.time_ms, self.depth)
+            except concurrent.futures.BrokenExecutor:
+                if self.pool is pool:
+                    self.pool = self._new_pool()  # Abgestürzten Pool für spätere Züge ersetzen
+                    pool.shutdown(wait=False)
+                raise
+
+    async def command(self, line, owned):
+        """
+        Führt einen Protokollbefehl aus.
+
+        Parameter:
+            line: Befehlszeile
+            owned: Menge der auf dieser Verbindung angelegten Spielnummern
+
+        Rückgabe:
+            Die Antwortzeile (ohne Zeilenende).
+        """
+        parts = line.split()
+        if not parts:
+            raise ValueError("leerer Befehl")
+        name = parts[0]
+        if name == 'new' and len(parts) == 1:
+            game = GameSession(next(self.ids))
+            self.sessions[game.id] = game
+            owned.add(game.id)
+            return 'ok ' + str(game.id)
+        if name == 'move' and len(parts) == 3:
+            game = self.session(parts[1], owned)
+            if not parts[2].isdigit() or not 1 <= int(parts[2]) <= COLS:
+                raise ValueError("ungültige Spalte " + parts[2])
+            col = int(parts[2]) - 1
+            async with game.lock:
+                if game.status != PLAYING:
+                    raise ValueError("Spiel ist beendet")
+                if not is_valid_location(game.board, col):
+                    raise ValueError("Spalte " + parts[2] + " ist voll")
+                game.play(col, PLAYER_INDEX)
+                if game.status != PLAYING:
+                    return 'ok - ' + game.status
+                try:
+                    reply = await self.search(game.moves)
+                except BaseException:
+                    game.undo(col, PLAYER_INDEX)  # Spieler bleibt am Zug, Zug kann wiederholt werden
+                    raise
+                game.play(reply, AI_INDEX)
+                return 'ok ' + str(reply + 1) + ' ' + game.status
+        if name == 'state' and len(parts) == 2:
+            game = self.session(parts[1], owned)
+            return 'ok ' + (game.moves or '-') + ' ' + game.status
+        if name == 'end' and len(parts) == 2:
+            game_id = self.session(parts[1], owned).id
+            del self.sessions[game_id]
+            owned.discard(game_id)
+            return 'ok'
+        raise ValueError("unbekannter Befehl " + name)
+
+    async def handle(self, reader, writer):
+        """
+        Bearbeitet eine Verbindung Zeile für Zeile. Beim Schließen werden
+        die Partien der Verbindung verworfen.
+        """
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.command(line.decode().strip(), owned)
+                except ValueError as e:
+                    response = 'err ' + str(e)
+                except Exception as e:
+                    # z. B. BrokenProcessPool: der Client bekommt trotzdem eine Antwort
+                    response = 'err Suche fehlgeschlagen: ' + type(e).__name__
+                writer.write((response + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in owned:
+                self.sessions.pop(game_id, None)
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=PORT, unix=None, **options):
+    """
+    Startet den Server und läuft, bis er abgebrochen wird.
+
+    Parameter:
+        host, port: TCP-Adresse (ignoriert, wenn unix gesetzt ist)
+        unix: Optionaler Pfad eines Unix-Sockets
+        options: Weitere Parameter für GameServer
+    """
+    game_server = GameServer(**options)
+    if unix is not None:
+        server = await asyncio.start_unix_server(game_server.handle, unix)
+        address = unix
+    else:
+        server = await asyncio.start_server(game_server.handle, host, port)
+        address = host + ':' + str(port)
+    print("Server auf " + address + " mit " + str(game_server.workers) + " Workern", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Vier-gewinnt-Server für viele gleichzeitige Partien.')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP-Adresse')
+    parser.add_argument('--port', type=int, default=PORT, help='TCP-Port')
+    parser.add_argument('--unix', help='Pfad eines Unix-Sockets statt TCP')
+    parser.add_argument('--workers', type=int, help='Anzahl der Prozesse')
+    parser.add_argument('--time-ms', type=int, default=TIME_MS, help='Zeitbudget je KI-Zug')
+    parser.add_argument('--depth', type=int, help='Feste Suchtiefe statt Zeitbudget')
+    parser.add_argument('--queue', type=int, help='Maximal gleichzeitig laufende Suchen')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, workers=args.workers,
+                          time_ms=args.time_ms, depth=args.depth, queue=args.queue))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+Simuliertes EV3-Backend für Läufe ohne Roboter (reines CPython).
+
+Bildet die benutzte Teilmenge der pybricks-API nach: EV3Brick (Tasten,
+Bildschirm, Lautsprecher), Motor, ColorSensor, TouchSensor, wait und
+StopWatch sowie ticks_ms/ticks_diff. Alle Zeiten laufen auf einer
+virtuellen Uhr, die durch wait(), blockierende Motorbefehle und
+Sensorabfragen vorgestellt wird. Damit lässt sich die Zeichenzeit des
+Plotters abschätzen, ohne real zu warten. Zusätzlich läuft die Uhr um die
+auf dem Host verbrauchte Rechenzeit weiter (z. B. die Suche der KI), sodass
+Rechnen und Zeichnen auf derselben Uhr gemessen werden; für reproduzierbare
+Zeichenzeiten lässt sich das mit WORLD.reset(realtime=False) abschalten.
+
+Modell:
+    - Motoren fahren mit trapezförmigem Geschwindigkeitsprofil
+      (Höchstgeschwindigkeit MAX_SPEED, Beschleunigung ACCELERATION).
+    - Der Berührungssensor ist gedrückt, sobald Motor C den Winkel
+      TOUCH_ANGLE erreicht; der Farbsensor sieht Rot, solange Motor B unter
+      dem Winkel EDGE_ANGLE steht.
+    - Tasteneingaben werden aus einem Skript abgespielt (siehe
+      script_columns).
+"""
+import time
+
+MAX_SPEED = 1000  # Höchstgeschwindigkeit eines Motors in °/s
+ACCELERATION = 2000  # Standardbeschleunigung in °/s²
+POLL_MS = 1  # Virtuelle Dauer einer Sensor- oder Tastenabfrage
+BEEP_MS = 100  # Dauer eines Signaltons
+TOUCH_ANGLE = 300  # Motor C: Winkel, ab dem der Berührungssensor auslöst
+EDGE_ANGLE = 400  # Motor B: Winkel, ab dem der Farbsensor kein Rot mehr sieht
+THINK_MS = 2000  # Virtuelle Bedenkzeit vor jeder skriptgesteuerten Eingabe
+THINK_POLLS = 20  # Anzahl Abfragen ohne Taste, auf die die Bedenkzeit verteilt wird
+
+
+class Port:
+    A = 'A'
+    B = 'B'
+    C = 'C'
+    D = 'D'
+    S1 = 'S1'
+    S2 = 'S2'
+    S3 = 'S3'
+    S4 = 'S4'
+
+
+class Button:
+    LEFT = 'LEFT'
+    RIGHT = 'RIGHT'
+    UP = 'UP'
+    DOWN = 'DOWN'
+    CENTER = 'CENTER'
+
+
+class Color:
+    BLACK = 'BLACK'
+    BLUE = 'BLUE'
+    GREEN = 'GREEN'
+    YELLOW = 'YELLOW'
+    RED = 'RED'
+    WHITE = 'WHITE'
+    BROWN = 'BROWN'
+
+
+class SimInputExhausted(Exception):
+    """
+    Wird ausgelöst, wenn eine Eingabe erwartet wird, das Skript aber leer ist.
+    """
+
+
+class SimWorld:
+    """
+    Gemeinsamer Zustand der Simulation: virtuelle Uhr, Motoren und Tastenskript.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, realtime=True):
+        """
+        Setzt Uhr, Motoren, Tastenskript und Protokolle zurück.
+
+        Parameter:
+            realtime: Rechenzeit des Hosts auf die virtuelle Uhr aufschlagen
+        """
+        self.clock = 0.0  # Virtuelle Zeit in ms (Stand der letzten Abfrage)
+        self.realtime = realtime
+        self.mark = time.perf_counter()  # Hostzeit der letzten Abfrage
+        self.motors = {}
+        self.script = []  # (Tastenzustand, Dauer in ms), je Abfrage ein Eintrag
+        self.idle_polls = 0  # Abfragen ohne Skript (Schutz gegen Endlosschleifen)
+        self.screen = []  # Zuletzt angezeigte Texte
+        self.beeps = 0
+
+    @property
+    def now(self):
+        """
+        Virtuelle Zeit in ms; mit realtime einschließlich der seit der
+        letzten Abfrage verbrauchten Rechenzeit des Hosts.
+        """
+        if self.realtime:
+            mark = time.perf_counter()
+            self.clock += (mark - self.mark) * 1000
+            self.mark = mark
+        return self.clock
+
+    def advance(self, ms):
+        """
+        Stellt die virtuelle Uhr um ms Millisekunden vor.
+        """
+        self.clock = self.now + ms
+
+    def advance_to(self, t):
+        """
+        Stellt die virtuelle Uhr auf den Zeitpunkt t vor (nie zurück).
+        """
+        if t > self.now:
+            self.clock = t
+
+
+WORLD = SimWorld()
+
+
+def wait(time):
+    """
+    Wartet time Millisekunden (virtuell).
+    """
+    WORLD.advance(time)
+
+
+def ticks_ms():
+    """
+    Zeitstempel der virtuellen Uhr in Millisekunden (wie time.ticks_ms).
+    """
+    return int(WORLD.now)
+
+
+def ticks_diff(end, start):
+    """
+    Differenz zweier Zeitstempel in Millisekunden.
+    """
+    return end - start
+
+
+class StopWatch:
+    """
+    Stoppuhr auf der virtuellen Uhr.
+    """
+
+    def __init__(self):
+        self.start = WORLD.now
+
+    def time(self):
+        return int(WORLD.now - self.start)
+
+    def reset(self):
+        self.start = WORLD.now
+
+
+def travel_ms(distance, speed, acceleration):
+    """
+    Dauer einer Fahrt über distance Grad mit trapezförmigem Profil.
+    """
+    distance = abs(distance)
+    speed = min(abs(speed), MAX_SPEED)
+    if distance == 0 or speed == 0:
+        return 0.0
+    ramp = speed * speed / acceleration  # Strecke für Beschleunigen + Bremsen
+    if distance >= ramp:
+        seconds = distance / speed + speed / acceleration
+    else:
+        seconds = 2 * (distance / acceleration) ** 0.5
+    return seconds * 1000
+
+
+class SimControl:
+    """
+    Nachbildung von Motor.control (done, limits).
+    """
+
+    def __init__(self, motor):
+        self.motor = motor
+        self.speed_limit = MAX_SPEED
+        self.acceleration = ACCELERATION
+        self.actuation = 100
+
+    def done(self):
+        # Kostet keine virtuelle Zeit (auf dem EV3 nur Mikrosekunden); die
+        # Warteschleifen in motion.py rufen selbst wait() auf
+        return self.motor.run_speed == 0 and WORLD.now >= self.motor.end_time
+
+    def limits(self, speed=None, acceleration=None, actuation=None):
+        if speed is None and acceleration is None and actuation is None:
+            return self.speed_limit, self.acceleration, self.actuation
+        if speed is not None:
+            self.speed_limit = speed
+        if acceleration is not None:
+            self.acceleration = acceleration
+        if actuation is not None:
+            self.actuation = actuation
+
+
+class Motor:
+    """
+    Simulierter EV3-Motor.
+    """
+
+    def __init__(self, port, *args, **kwargs):
+        self.port = port
+        self.control = SimControl(self)
+        self.start_angle = 0.0
+        self.target = 0.0
+        self.start_time = 0.0
+        self.end_time = 0.0
+        self.run_speed = 0  # Dauerbetrieb über run()
+        self.offset = 0.0  # Physikalischer Winkel minus gemeldeter Winkel
+        previous = WORLD.motors.get(port)
+        if previous is not None:
+            # Neustart des Programms: Zähler beginnt bei 0, die Achse bleibt stehen
+            self.offset = previous.physical_angle()
+        WORLD.motors[port] = self
+
+    def angle(self):
+        now = WORLD.now
+        if self.run_speed:
+            return self.start_angle + self.run_speed * (now - self.start_time) / 1000
+        if now >= self.end_time or self.end_time == self.start_time:
+            return self.target
+        fraction = (now - self.start_time) / (self.end_time - self.start_time)
+        return self.start_angle + (self.target - self.start_angle) * fraction
+
+    def physical_angle(self):
+        """
+        Winkel relativ zur Einschaltposition (unabhängig von reset_angle).
+        """
+        return self.angle() + self.offset
+
+    def reset_angle(self, angle):
+        self.stop()
+        self.offset += self.target - angle
+        self.start_angle = angle
+        self.target = angle
+        self.end_time = WORLD.now
+
+    def speed(self):
+        return self.run_speed
+
+    def run(self, speed):
+        self.start_angle = self.angle()
+        self.start_time = WORLD.now
+        self.run_speed = max(-MAX_SPEED, min(MAX_SPEED, speed))
+
+    def stop(self):
+        angle = self.angle()
+        self.run_speed = 0
+        self.start_angle = angle
+        self.target = angle
+        self.start_time = WORLD.now
+        self.end_time = WORLD.now
+
+    brake = stop
+    hold = stop
+
+    def run_target(self, speed, target_angle, then=None, wait=True):
+        start = self.angle()
+        self.run_speed = 0
+        self.start_angle = start
+        self.target = target_angle
+        self.start_time = WORLD.now
+        speed = min(abs(speed), self.control.speed_limit)
+        self.end_time = WORLD.now + travel_ms(target_angle - start, speed,
+                                              self.control.acceleration)
+        if wait:
+            WORLD.advance_to(self.end_time)
+
+    def run_angle(self, speed, rotation_angle, then=None, wait=True):
+        self.run_target(speed, self.angle() + rotation_angle, then, wait)
+
+    def run_time(self, speed, time, then=None, wait=True):
+        self.run_target(speed, self.angle() + speed * time / 1000, then, wait)
+
+
+class TouchSensor:
+    """
+    Simulierter Berührungssensor am oberen Anschlag von Motor C.
+    """
+
+    def __init__(self, port):
+        self.port = port
+
+    def pressed(self):
+        WORLD.advance(POLL_MS)
+        motor = WORLD.motors.get(Port.C)
+        return motor is not None and motor.physical_angle() >= TOUCH_ANGLE
+
+
+class ColorSensor:
+    """
+    Simulierter Farbsensor an der Blattkante (Motor B).
+    """
+
+    def __init__(self, port):
+        self.port = port
+
+    def color(self):
+        WORLD.advance(POLL_MS)
+        motor = WORLD.motors.get(Port.B)
+        if motor is not None and motor.physical_angle() < EDGE_ANGLE:
+            return Color.RED
+        return Color.WHITE
+
+
+class SimButtons:
+    """
+    Spielt Tastenzustände aus WORLD.script ab.
+    """
+
+    def pressed(self):
+        WORLD.advance(POLL_MS)
+        if WORLD.script:
+            WORLD.idle_polls = 0
+            buttons, ms = WORLD.script.pop(0)
+            WORLD.advance(ms)
+            return buttons
+        WORLD.idle_polls += 1
+        if WORLD.idle_polls > 100000:
+            raise SimInputExhausted()
+        return []
+
+
+class SimScreen:
+    def clear(self):
+        WORLD.screen = []
+
+    def draw_text(self, x, y, text, *args, **kwargs):
+        WORLD.screen.append(text)
+
+    def print(self, *args):
+        WORLD.screen.append(' '.join(str(a) for a in args))
+
+
+class SimSpeaker:
+    def beep(self, frequency=500, duration=BEEP_MS):
+        WORLD.beeps += 1
+        WORLD.advance(duration)
+
+
+class EV3Brick:
+    """
+    Simulierter EV3-Stein; alle Instanzen teilen sich WORLD.
+    """
+
+    def __init__(self):
+        self.buttons = SimButtons()
+        self.screen = SimScreen()
+        self.speaker = SimSpeaker()
+
+
+def script_columns(columns, think_ms=THINK_MS, think_polls=THINK_POLLS):
+    """
+    Hängt Tastendrücke an das Skript an, die nacheinander die gegebenen
+    Spalten auswählen (Auswahl beginnt jeweils bei Spalte 0).
+
+    Parameter:
+        columns: Liste von Spaltenindizes
+        think_ms: Virtuelle Bedenkzeit vor jeder Eingabe
+        think_polls: Anzahl der Abfragen ohne Taste während der Bedenkzeit
+    """
+    for col in columns:
+        for _ in range(think_polls):
+            WORLD.script.append(([], think_ms / think_polls))
+        for _ in range(col):
+            WORLD.script.append(([Button.RIGHT], 0))
+        WORLD.script.append(([Button.CENTER], 0))
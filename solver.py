@@ -0,0 +1,291 @@
+"""
+Exakter Endspiel-Löser (Negamax mit Null-Fenster-Suche).
+
+Bewertungen sind aus Sicht des Spielers am Zug angegeben:
+    > 0: Sieg, je größer, desto schneller
+    = 0: Unentschieden
+    < 0: Niederlage, je näher an 0, desto später
+Ein Sieg mit dem n-ten Stein auf dem Spielfeld (n = 1 .. 42) hat den Wert
+(SIZE + 2 - n) // 2. Mit diesen Werten spielt der Löser den schnellsten
+Sieg bzw. die längste Verteidigung.
+
+Prüfung von result_of gegen eine vollständige Suche (nur auf dem Host):
+    python solver.py --positions 120 --empty 8
+"""
+from bitboard import Position, ROWS, COLS, column_mask, winning_cells
+from transposition import TranspositionTable, LOWER, UPPER
+
+SIZE = ROWS * COLS  # Anzahl der Zellen
+SOLVER_EMPTY_CELLS = 12  # Löser übernimmt, wenn weniger freie Zellen übrig sind
+SOLVER_TT_SIZE = 8192  # Einträge der Transpositionstabelle des Lösers
+
+CENTER_ORDER = (3, 2, 4, 1, 5, 0, 6)  # Mittlere Spalten zuerst
+COLUMN_MASKS = tuple(column_mask(c) for c in range(COLS))
+
+WIN = 1  # Ergebnis: Spieler am Zug gewinnt
+DRAW = 0  # Ergebnis: Unentschieden
+LOSS = -1  # Ergebnis: Spieler am Zug verliert
+
+
+def negamax(pos, player, alpha, beta, tt):
+    """
+    Negamax mit Alpha-Beta-Pruning auf einer Bitboard-Position.
+    Die Position darf noch nicht entschieden sein.
+
+    Parameter:
+        pos: Die Position (wird während der Suche verändert und wiederhergestellt)
+        player: Spielerindex am Zug
+        alpha: Untere Fenstergrenze
+        beta: Obere Fenstergrenze
+        tt: Transpositionstabelle
+
+    Rückgabe:
+        Exakte Bewertung, falls sie im Fenster liegt, sonst eine Schranke.
+    """
+    own = pos.masks[player]
+    opp = pos.masks[1 - player]
+    mask = own | opp
+    possible = pos.valid_mask()
+    moves = pos.moves
+
+    # Direkter Sieg
+    if winning_cells(own, mask) & possible:
+        return (SIZE + 1 - moves) // 2
+
+    # Gegnerische Drohungen: erzwungener Block oder verloren
+    opp_win = winning_cells(opp, mask)
+    forced = possible & opp_win
+    if forced:
+        if forced & (forced - 1):
+            return -((SIZE - moves) // 2)  # Zwei Drohungen können nicht beide geblockt werden
+        possible = forced
+    # Keine Züge direkt unter eine gegnerische Gewinnzelle
+    non_losing = possible & ~(opp_win >> 1)
+    if not non_losing:
+        return -((SIZE - moves) // 2)
+
+    if moves >= SIZE - 2:
+        return 0  # In den letzten zwei Zügen kann niemand mehr gewinnen
+
+    # Schranken aus der Anzahl der verbleibenden Züge
+    max_score = (SIZE - 1 - moves) // 2
+    if beta > max_score:
+        beta = max_score
+        if alpha >= beta:
+            return beta
+    min_score = -((SIZE - 2 - moves) // 2)
+    if alpha < min_score:
+        alpha = min_score
+        if alpha >= beta:
+            return alpha
+
+    # Transpositionstabelle
+    entry = tt.probe(pos.hash)
+    if entry >= 0:
+        if tt.flags[entry] == LOWER:
+            if tt.values[entry] > alpha:
+                alpha = tt.values[entry]
+        elif tt.values[entry] < beta:
+            beta = tt.values[entry]
+        if alpha >= beta:
+            return alpha
+
+    alpha_orig = alpha
+    best_col = -1
+    for col in CENTER_ORDER:
+        if non_losing & COLUMN_MASKS[col]:
+            pos.play(col, player)
+            score = -negamax(pos, 1 - player, -beta, -alpha, tt)
+            pos.undo(col, player)
+            if score >= beta:
+                tt.store(pos.hash, 0, score, LOWER, col)
+                return score
+            if score > alpha:
+                alpha = score
+                best_col = col
+
+    tt.store(pos.hash, 0, alpha, UPPER, best_col)
+    return alpha
+
+
+def _null_window_value(pos, player, tt):
+    """
+    Bestimmt den exakten Wert einer Position durch wiederholte
+    Null-Fenster-Suchen (Bisektion über den möglichen Wertebereich).
+    """
+    low = -((SIZE - pos.moves) // 2)
+    high = (SIZE + 1 - pos.moves) // 2
+    while low < high:
+        med = low + (high - low) // 2
+        # Zuerst in Richtung 0 testen, dort liegen die meisten Ergebnisse
+        if med <= 0 and low // 2 < med:
+            med = low // 2
+        elif med >= 0 and high // 2 > med:
+            med = high // 2
+        r = negamax(pos, player, med, med + 1, tt)
+        if r <= med:
+            high = r
+        else:
+            low = r
+    return low
+
+
+def solve(board, player, tt=None):
+    """
+    Löst eine Position exakt und wählt den besten Zug.
+
+    Parameter:
+        board: Das Spielfeld (Position, wird nicht verändert)
+        player: Spielerindex am Zug
+        tt: Optionale Transpositionstabelle (Werte des Lösers, nicht mit
+            der Minimax-Tabelle mischen)
+
+    Rückgabe:
+        Tuple (Spalte, Bewertung) aus Sicht des Spielers am Zug.
+    """
+    if tt is None:
+        tt = TranspositionTable(SOLVER_TT_SIZE)
+    pos = Position.copy(board)  # Ohne inkrementelle Bewertung (schneller)
+    own = pos.masks[player]
+    mask = pos.mask()
+    possible = pos.valid_mask()
+
+    # Direkter Sieg
+    wins = winning_cells(own, mask) & possible
+    if wins:
+        for col in CENTER_ORDER:
+            if wins & COLUMN_MASKS[col]:
+                return col, (SIZE + 1 - pos.moves) // 2
+
+    # Erst den Wert der Position, dann einen Zug, der ihn erreicht
+    value = _null_window_value(pos, player, tt)
+    fallback = -1
+    for col in CENTER_ORDER:
+        if not pos.can_play(col):
+            continue
+        if fallback < 0:
+            fallback = col
+        pos.play(col, player)
+        if pos.is_win(player):
+            score = (SIZE + 2 - pos.moves) // 2
+        elif pos.is_full():
+            score = 0
+        else:
+            # Null-Fenster-Test: erreicht dieser Zug mindestens value?
+            score = -negamax(pos, 1 - player, -value, -value + 1, tt)
+        pos.undo(col, player)
+        if score >= value:
+            return col, value
+    return fallback, value
+
+
+def result_of(board, score):
+    """
+    Übersetzt eine Bewertung des Lösers in Ergebnis und Entfernung.
+
+    Parameter:
+        board: Das Spielfeld, für das die Bewertung gilt
+        score: Bewertung aus Sicht des Spielers am Zug
+
+    Rückgabe:
+        Tuple (Ergebnis, Halbzüge): Ergebnis ist WIN, DRAW oder LOSS;
+        Halbzüge ist die Anzahl der Züge bis zum Gewinnzug (inklusive)
+        bzw. bis zum vollen Spielfeld bei Unentschieden.
+    """
+    moves = board.moves
+    if score == 0:
+        return DRAW, SIZE - moves
+    if score > 0:
+        # Gewinnzug mit dem n-ten Stein, n hat dieselbe Parität wie moves + 1
+        n = SIZE + 2 - 2 * score
+        if (n - moves) % 2 == 0:
+            n -= 1
+        return WIN, n - moves
+    # Gegnerischer Gewinnzug mit dem n-ten Stein, n hat dieselbe Parität wie moves
+    n = SIZE + 2 + 2 * score
+    if (n - moves) % 2 == 1:
+        n -= 1
+    return LOSS, n - moves
+
+
+def brute_force(pos, player):
+    """
+    Ergebnis und Entfernung durch vollständige Suche ohne Pruning (nur für
+    kleine Endspiele, zur Prüfung von result_of). Die Position darf noch
+    nicht entschieden sein.
+
+    Rückgabe:
+        Tuple (Ergebnis, Halbzüge) wie result_of.
+    """
+    best = None
+    best_key = None
+    for col in range(COLS):
+        if not pos.can_play(col):
+            continue
+        pos.play(col, player)
+        if pos.is_win(player):
+            result, plies = WIN, 1
+        elif pos.is_full():
+            result, plies = DRAW, 1
+        else:
+            result, plies = brute_force(pos, 1 - player)
+            result, plies = -result, plies + 1
+        pos.undo(col, player)
+        # Schnellster Sieg, sonst Remis, sonst längste Verteidigung
+        key = (result, -plies if result == WIN else plies)
+        if best_key is None or key > best_key:
+            best = (result, plies)
+            best_key = key
+    return best
+
+
+def check_result_of(positions=120, empty=8, seed=1):
+    """
+    Vergleicht result_of(solve(...)) mit brute_force auf zufälligen,
+    noch offenen Endspielen (nur auf dem Host).
+
+    Rückgabe:
+        Liste der Abweichungen als Tupel (Zugfolge, erwartet, erhalten).
+    """
+    import random
+
+    rng = random.Random(seed)
+    errors = []
+    checked = 0
+    while checked < positions:
+        pos = Position()
+        moves = ''
+        while pos.moves < SIZE - empty and not (pos.is_win(0) or pos.is_win(1)):
+            col = rng.choice([c for c in range(COLS) if pos.can_play(c)])
+            pos.play(col, pos.moves % 2)
+            moves += str(col + 1)
+        if pos.is_win(0) or pos.is_win(1):
+            continue  # Spiel schon entschieden
+        player = pos.moves % 2
+        expected = brute_force(pos, player)
+        got = result_of(pos, solve(pos, player)[1])
+        if got != expected:
+            errors.append((moves, expected, got))
+        checked += 1
+    return errors
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Prüft result_of gegen eine vollständige Suche.')
+    parser.add_argument('--positions', type=int, default=120, help='Anzahl der Endspiele')
+    parser.add_argument('--empty', type=int, default=8, help='Freie Zellen je Endspiel')
+    parser.add_argument('--seed', type=int, default=1, help='Startwert der Zufallszüge')
+    args = parser.parse_args(argv)
+
+    errors = check_result_of(args.positions, args.empty, args.seed)
+    for moves, expected, got in errors:
+        print(moves + ": erwartet " + str(expected) + ", erhalten " + str(got))
+    print(str(args.positions) + " Endspiele, " + str(len(errors)) + " Abweichungen")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
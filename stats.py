@@ -0,0 +1,184 @@
+"""
+Instrumentierung der KI-Suche.
+
+SearchStats wird optional durch minimax und iterative_deepening gereicht.
+Ist kein Objekt übergeben (stats=None), zählt die Suche nichts; es bleibt
+je Knoten nur die Prüfung auf None.
+
+Für play_game gibt es zwei fertige Protokollfunktionen (on_move):
+screen_logger zeigt die Werte auf dem EV3-Bildschirm, TraceFile schreibt
+je KI-Zug eine JSON-Zeile in eine Datei. HeapMonitor misst je KI-Zug die
+Spitzenbelegung des Heaps und die Anzahl der Garbage Collections.
+"""
+import gc
+import json
+
+try:
+    import tracemalloc  # CPython
+except ImportError:
+    tracemalloc = None  # MicroPython: gc.mem_alloc wird stichprobenartig gelesen
+
+COLS = 7  # Maximale Anzahl Züge pro Knoten
+
+
+class SearchStats:
+    """
+    Zähler einer Suche.
+
+    Attribute:
+        nodes: Besuchte Knoten
+        leaves: Blätter mit heuristischer Bewertung (Tiefe 0)
+        terminals: Erkannte Endpositionen (Sieg, Niederlage, volles Feld)
+        cutoffs: Alpha-/Beta-Cutoffs je Index des Zuges in der Zugliste
+        tt_probes: Abfragen der Transpositionstabelle
+        tt_hits: Abfragen mit passendem Eintrag ausreichender Tiefe
+        tt_cutoffs: Knoten, die direkt aus der Tabelle beantwortet wurden
+        threat_wins: Knoten mit sofortigem Gewinnzug (ohne Verzweigung)
+        threat_prunes: Knoten, deren Zugliste durch Drohungen verkleinert wurde
+        depth_ms: Dauer je abgeschlossener Tiefe der iterativen Vertiefung
+        heap: Optionaler HeapMonitor; die Suche ruft alle 64 Knoten sample() auf
+    """
+
+    def __init__(self, heap=None):
+        self.heap = heap
+        self.reset()
+
+    def reset(self):
+        """
+        Setzt alle Zähler zurück.
+        """
+        self.nodes = 0
+        self.leaves = 0
+        self.terminals = 0
+        self.cutoffs = [0] * COLS
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.threat_wins = 0
+        self.threat_prunes = 0
+        self.depth_ms = {}
+
+    def record_depth(self, depth, ms):
+        """
+        Speichert die Dauer einer abgeschlossenen Iteration.
+        """
+        self.depth_ms[depth] = ms
+
+    def first_move_cutoff_rate(self):
+        """
+        Anteil der Cutoffs, die schon beim ersten Zug eintraten.
+        """
+        total = sum(self.cutoffs)
+        return self.cutoffs[0] / total if total else 0.0
+
+    def as_dict(self):
+        """
+        Gibt die Zähler als Dictionary zurück.
+        """
+        return {
+            'nodes': self.nodes,
+            'leaves': self.leaves,
+            'terminals': self.terminals,
+            'cutoffs': self.cutoffs[:],
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_cutoffs': self.tt_cutoffs,
+            'threat_wins': self.threat_wins,
+            'threat_prunes': self.threat_prunes,
+            'depth_ms': dict(self.depth_ms),
+        }
+
+
+class HeapMonitor:
+    """
+    Misst Spitzenbelegung des Heaps und Anzahl der Garbage Collections
+    während eines KI-Zuges.
+
+    Unter CPython liefert tracemalloc die Spitze und gc.get_stats die
+    Anzahl der Sammelläufe. Unter MicroPython wird gc.mem_alloc() bei jedem
+    sample() gelesen; ein Rückgang der Belegung zählt als Sammellauf. Die
+    Werte sind dort eine Näherung (Auflösung: ein Aufruf je 64 Knoten).
+
+    Attribute:
+        peak: Spitzenbelegung über der Belegung beim Start in Bytes
+        collections: Anzahl der Garbage Collections
+    """
+
+    def __init__(self):
+        self.peak = 0
+        self.collections = 0
+        self._base = 0
+        self._last = 0
+        self._gc = 0
+
+    def start(self):
+        """
+        Räumt den Heap auf und beginnt eine neue Messung.
+        """
+        gc.collect()
+        self.peak = 0
+        self.collections = 0
+        if tracemalloc is not None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+            self._gc = sum(s['collections'] for s in gc.get_stats())
+        else:
+            self._base = gc.mem_alloc()
+            self._last = self._base
+
+    def sample(self):
+        """
+        Liest die aktuelle Belegung (nur unter MicroPython nötig).
+        """
+        if tracemalloc is not None:
+            return
+        used = gc.mem_alloc()
+        if used < self._last:
+            self.collections += 1
+        if used - self._base > self.peak:
+            self.peak = used - self._base
+        self._last = used
+
+    def stop(self):
+        """
+        Beendet die Messung.
+
+        Rückgabe:
+            Dictionary mit heap_peak (Bytes) und gc_count.
+        """
+        if tracemalloc is not None:
+            self.peak = tracemalloc.get_traced_memory()[1] - self._base
+            self.collections = sum(s['collections'] for s in gc.get_stats()) - self._gc
+        else:
+            self.sample()
+        return {'heap_peak': self.peak, 'gc_count': self.collections}
+
+
+def screen_logger(ev3):
+    """
+    Erstellt eine on_move-Funktion, die die Werte eines KI-Zuges auf dem
+    EV3-Bildschirm anzeigt.
+    """
+    def on_move(info):
+        ev3.screen.clear()
+        ev3.screen.draw_text(0, 10, "Spalte " + str(info['col'] + 1) + " (" + info['source'] + ")")
+        ev3.screen.draw_text(0, 30, "Zeit " + str(info['time_ms']) + " ms")
+        stats = info.get('stats')
+        if stats is not None:
+            ev3.screen.draw_text(0, 50, "Tiefe " + str(info['depth']) + ", " + str(stats['nodes']) + " Kn.")
+    return on_move
+
+
+class TraceFile:
+    """
+    on_move-Funktion, die je KI-Zug eine JSON-Zeile an eine Datei anhängt.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, info):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(info) + "\n")
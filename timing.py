@@ -0,0 +1,67 @@
+"""
+Millisekunden-Zeitmessung für EV3 (MicroPython) und Host (CPython).
+"""
+
+try:
+    from time import ticks_ms, ticks_diff  # MicroPython
+except ImportError:
+    import time
+
+    def ticks_ms():
+        """
+        Gibt einen monotonen Zeitstempel in Millisekunden zurück.
+        """
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(end, start):
+        """
+        Gibt die Differenz zweier Zeitstempel in Millisekunden zurück.
+        """
+        return end - start
+
+
+class SearchTimeout(Exception):
+    """
+    Wird ausgelöst, wenn das Zeitbudget einer Suche abgelaufen ist.
+    """
+
+
+class SearchTimer:
+    """
+    Prüft während der Suche, ob das Zeitbudget abgelaufen ist.
+    Die Uhr wird nur alle `interval` Knoten gelesen. Eine optionale
+    Funktion hook wird im selben Takt aufgerufen (z. B. DrawJob.poll, damit
+    der Plotter während der Suche weiterzeichnet).
+    """
+
+    def __init__(self, budget_ms, interval=64, hook=None):
+        self.start = ticks_ms()
+        self.budget_ms = budget_ms
+        self.interval = interval
+        self.countdown = interval
+        self.hook = hook
+
+    def elapsed(self):
+        """
+        Gibt die seit dem Start vergangene Zeit in Millisekunden zurück.
+        """
+        return ticks_diff(ticks_ms(), self.start)
+
+    def expired(self):
+        """
+        True, wenn das Zeitbudget aufgebraucht ist.
+        """
+        return self.elapsed() >= self.budget_ms
+
+    def tick(self):
+        """
+        Wird einmal pro Suchknoten aufgerufen und löst SearchTimeout aus,
+        sobald das Zeitbudget aufgebraucht ist.
+        """
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.countdown = self.interval
+            if self.hook is not None:
+                self.hook()
+            if self.expired():
+                raise SearchTimeout()
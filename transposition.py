@@ -0,0 +1,141 @@
+"""
+Transpositionstabelle für die Minimax-Suche.
+
+Die Tabelle hat eine feste Anzahl an Einträgen und legt ihre Daten in
+parallelen, vorab angelegten Listen ab, damit der Speicherbedarf auf dem
+EV3 (MicroPython-Heap) vorhersehbar bleibt. Der Index eines Eintrags ist
+hash % size; der vollständige Hash wird zur Erkennung von Kollisionen
+mitgespeichert.
+"""
+
+# Art der gespeicherten Bewertung
+EXACT = 0  # Exakter Wert
+LOWER = 1  # Untere Schranke (Beta-Cutoff)
+UPPER = 2  # Obere Schranke (kein Zug hat Alpha verbessert)
+
+# Ersetzungsstrategien
+REPLACE_ALWAYS = 'always'  # Neuer Eintrag überschreibt immer
+REPLACE_DEPTH = 'depth'  # Tiefere Einträge der aktuellen Suche bleiben erhalten
+
+TT_SIZE = 4096  # Standardanzahl der Einträge
+
+
+class TranspositionTable:
+    """
+    Transpositionstabelle mit begrenzter Größe und Ersetzungsstrategie.
+
+    Attribute:
+        size: Anzahl der Einträge
+        replacement: REPLACE_ALWAYS oder REPLACE_DEPTH
+        hits: Anzahl der Abfragen mit passendem Eintrag
+        misses: Anzahl der Abfragen auf einen leeren Platz
+        collisions: Anzahl der Abfragen auf einen Platz mit fremdem Hash
+        stores: Anzahl der geschriebenen Einträge
+        rejected: Anzahl der wegen der Ersetzungsstrategie verworfenen Einträge
+    """
+
+    def __init__(self, size=TT_SIZE, replacement=REPLACE_DEPTH):
+        if replacement not in (REPLACE_ALWAYS, REPLACE_DEPTH):
+            raise ValueError("Unbekannte Ersetzungsstrategie: " + str(replacement))
+        self.size = size
+        self.replacement = replacement
+        self.keys = [-1] * size  # -1 markiert einen leeren Platz
+        self.values = [0] * size
+        self.depths = [0] * size
+        self.flags = [EXACT] * size
+        self.moves = [-1] * size
+        self.ages = [0] * size
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Setzt die Zähler für Treffer, Fehlschläge und Kollisionen zurück.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.rejected = 0
+
+    def clear(self):
+        """
+        Löscht alle Einträge und Zähler.
+        """
+        for i in range(self.size):
+            self.keys[i] = -1
+        self.age = 0
+        self.reset_stats()
+
+    def new_search(self):
+        """
+        Markiert den Beginn einer neuen Suche. Einträge früherer Suchen
+        dürfen danach auch bei REPLACE_DEPTH überschrieben werden.
+        """
+        self.age += 1
+
+    def probe(self, key):
+        """
+        Sucht den Eintrag zu einem Hash.
+
+        Parameter:
+            key: Zobrist-Hash der Position
+
+        Rückgabe:
+            Der Index des Eintrags (für values, depths, flags, moves)
+            oder -1, wenn kein passender Eintrag existiert.
+        """
+        index = key % self.size
+        stored = self.keys[index]
+        if stored == key:
+            self.hits += 1
+            return index
+        if stored == -1:
+            self.misses += 1
+        else:
+            self.collisions += 1
+        return -1
+
+    def store(self, key, depth, value, flag, move):
+        """
+        Speichert ein Suchergebnis gemäß der Ersetzungsstrategie.
+
+        Parameter:
+            key: Zobrist-Hash der Position
+            depth: Verbleibende Suchtiefe des Ergebnisses
+            value: Bewertung
+            flag: EXACT, LOWER oder UPPER
+            move: Bester gefundener Zug (Spalte)
+        """
+        index = key % self.size
+        if self.replacement == REPLACE_DEPTH:
+            stored = self.keys[index]
+            if (stored != -1 and stored != key and self.ages[index] == self.age
+                    and self.depths[index] > depth):
+                self.rejected += 1
+                return
+        self.keys[index] = key
+        self.values[index] = value
+        self.depths[index] = depth
+        self.flags[index] = flag
+        self.moves[index] = move
+        self.ages[index] = self.age
+        self.stores += 1
+
+    def stats(self):
+        """
+        Gibt die Zähler als Dictionary zurück.
+        """
+        used = 0
+        for k in self.keys:
+            if k != -1:
+                used += 1
+        return {
+            'size': self.size,
+            'used': used,
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'rejected': self.rejected,
+        }
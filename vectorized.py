@@ -0,0 +1,227 @@
+"""
+Vektorisierte Bewertung und Selbstspiel mit NumPy (nur auf dem Host).
+
+N Spielfelder liegen als int8-Array der Form (N, ROWS, COLS), Zeile 0 unten,
+mit den Codes EMPTY_CODE, PLAYER_CODE und AI_CODE. Die 69 Viererfenster
+aus evaluation.WINDOWS werden einmalig in ein Index-Array (69, 4) auf das
+flache Spielfeld übersetzt; Fensterbewertung und Gewinnprüfung laufen dann
+für alle Spielfelder gleichzeitig.
+
+Die Gewichte sind als Tupel (vier, drei, zwei, gegnerische drei,
+Mittelspalte) einstellbar. DEFAULT_WEIGHTS entspricht score_position.
+
+Aufruf:
+    python vectorized.py --games 100000 --epsilon 0.1
+    python vectorized.py --games 100000 --weights 100 5 2 -4 3 --opponent 100 6 2 -5 3
+"""
+import sys
+import time
+
+import numpy as np
+
+from bitboard import ROWS, COLS, H1
+from evaluation import WINDOWS, CENTER_COL
+
+EMPTY_CODE = 0
+PLAYER_CODE = 1
+AI_CODE = 2
+
+DEFAULT_WEIGHTS = (100, 5, 2, -4, 3)  # Vier, drei, zwei, gegnerische drei, Mittelspalte
+WIN_VALUE = 1 << 30  # Bewertung eines Gewinnzuges im Selbstspiel
+
+# Fenster als Indizes in das flache Spielfeld (row * COLS + col)
+WINDOW_INDEX = np.array([[(i % H1) * COLS + i // H1 for i in window] for window in WINDOWS],
+                        dtype=np.intp)
+CENTER_INDEX = np.arange(ROWS) * COLS + CENTER_COL
+
+
+def score_table(weights=DEFAULT_WEIGHTS):
+    """
+    Bewertung je Fenster nach Steinanzahl (Index own * 5 + opp).
+
+    Rückgabe:
+        int32-Array mit 25 Einträgen (gleiche Regeln wie evaluate_window).
+    """
+    four, three, two, opp_three = weights[:4]
+    table = np.zeros(25, dtype=np.int32)
+    for own in range(5):
+        for opp in range(5 - own):
+            empty = 4 - own - opp
+            score = 0
+            if own == 4:
+                score += four
+            elif own == 3 and empty == 1:
+                score += three
+            elif own == 2 and empty == 2:
+                score += two
+            if opp == 3 and empty == 1:
+                score += opp_three
+            table[own * 5 + opp] = score
+    return table
+
+
+def from_positions(positions):
+    """
+    Wandelt eine Liste von Positionen (bitboard.Position) in ein Array um.
+    """
+    boards = np.zeros((len(positions), ROWS, COLS), dtype=np.int8)
+    for n, board in enumerate(positions):
+        for r in range(ROWS):
+            for c in range(COLS):
+                index = board.cell(r, c)
+                if index is not None:
+                    boards[n, r, c] = index + 1
+    return boards
+
+
+def window_counts(boards, code):
+    """
+    Anzahl der Steine mit dem Code in jedem Fenster.
+
+    Rückgabe:
+        int8-Array der Form (N, 69).
+    """
+    flat = boards.reshape(len(boards), ROWS * COLS)
+    return (flat[:, WINDOW_INDEX] == code).sum(axis=2, dtype=np.int8)
+
+
+def score_boards(boards, code, weights=DEFAULT_WEIGHTS, table=None):
+    """
+    Bewertet alle Spielfelder für einen Spieler (wie score_position).
+
+    Parameter:
+        boards: Array (N, ROWS, COLS)
+        code: PLAYER_CODE oder AI_CODE
+        weights: Gewichte (vier, drei, zwei, gegnerische drei, Mittelspalte)
+        table: Optional vorab berechnete score_table(weights)
+
+    Rückgabe:
+        int32-Array mit N Bewertungen.
+    """
+    if table is None:
+        table = score_table(weights)
+    own = window_counts(boards, code).astype(np.intp)
+    opp = window_counts(boards, PLAYER_CODE + AI_CODE - code)
+    scores = table[own * 5 + opp].sum(axis=1, dtype=np.int32)
+    flat = boards.reshape(len(boards), ROWS * COLS)
+    return scores + (flat[:, CENTER_INDEX] == code).sum(axis=1, dtype=np.int32) * weights[4]
+
+
+def has_four(boards, code):
+    """
+    Prüft für alle Spielfelder, ob der Spieler vier in einer Reihe hat.
+
+    Rückgabe:
+        bool-Array mit N Einträgen.
+    """
+    return (window_counts(boards, code) == 4).any(axis=1)
+
+
+def winners(boards):
+    """
+    Gewinner aller Spielfelder (PLAYER_CODE, AI_CODE oder EMPTY_CODE).
+    """
+    result = np.full(len(boards), EMPTY_CODE, dtype=np.int8)
+    result[has_four(boards, PLAYER_CODE)] = PLAYER_CODE
+    result[has_four(boards, AI_CODE)] = AI_CODE
+    return result
+
+
+def heights(boards):
+    """
+    Anzahl der Steine je Spalte, Form (N, COLS).
+    """
+    return (boards != EMPTY_CODE).sum(axis=1)
+
+
+def self_play(games, weights=(DEFAULT_WEIGHTS, DEFAULT_WEIGHTS), epsilon=0.1, seed=None):
+    """
+    Spielt alle Partien im Gleichschritt: je Halbzug werden für jede noch
+    laufende Partie alle sieben Folgestellungen auf einmal bewertet. Ein
+    Gewinnzug wird immer gespielt, eine sofortige Drohung des Gegners immer
+    abgewehrt, sonst der Zug mit der besten Bewertung oder mit
+    Wahrscheinlichkeit epsilon ein zufälliger Zug.
+
+    Parameter:
+        games: Anzahl der Partien
+        weights: Gewichte für Spieler (beginnt) und KI
+        epsilon: Anteil zufälliger Züge
+        seed: Startwert des Zufallsgenerators
+
+    Rückgabe:
+        Tuple (Gewinner, Länge): je ein Array mit einem Eintrag pro Partie.
+    """
+    rng = np.random.default_rng(seed)
+    tables = (score_table(weights[0]), score_table(weights[1]))
+    boards = np.zeros((games, ROWS, COLS), dtype=np.int8)
+    column_heights = np.zeros((games, COLS), dtype=np.intp)
+    winner = np.full(games, EMPTY_CODE, dtype=np.int8)
+    length = np.full(games, ROWS * COLS, dtype=np.int8)
+    active = np.arange(games)
+    cols = np.arange(COLS)
+
+    for ply in range(ROWS * COLS):
+        if not len(active):
+            break
+        side = ply % 2
+        code = PLAYER_CODE + side
+        m = len(active)
+        rows = np.arange(m)
+        hs = column_heights[active]
+        legal = hs < ROWS
+
+        # Alle sieben Folgestellungen je Partie (volle Spalten werden verworfen)
+        children = np.repeat(boards[active][:, None], COLS, axis=1)
+        top = np.minimum(hs, ROWS - 1)
+        children[rows[:, None], cols[None, :], top, cols[None, :]] = PLAYER_CODE + AI_CODE - code
+        children = children.reshape(m * COLS, ROWS, COLS)
+        threats = has_four(children, PLAYER_CODE + AI_CODE - code).reshape(m, COLS) & legal
+        children.reshape(m, COLS, ROWS, COLS)[rows[:, None], cols[None, :], top, cols[None, :]] = code
+        wins = has_four(children, code).reshape(m, COLS) & legal
+        values = score_boards(children, code, weights[side], tables[side]).reshape(m, COLS)
+
+        # Gewinnzug vor Abwehr einer gegnerischen Drohung vor Bewertung
+        forced = threats.any(axis=1) & ~wins.any(axis=1)
+        values = np.where(wins, WIN_VALUE, values).astype(np.float64)
+        values[forced] = np.where(threats[forced], WIN_VALUE, 0)
+        explore = (rng.random(m) < epsilon) & ~wins.any(axis=1) & ~forced
+        values[explore] = 0
+        values += rng.random((m, COLS))  # Gleichstand zufällig auflösen
+        values[~legal] = -np.inf
+        choice = values.argmax(axis=1)
+
+        boards[active, hs[rows, choice], choice] = code
+        column_heights[active, choice] += 1
+        won = wins[rows, choice]
+        winner[active[won]] = code
+        length[active[won]] = ply + 1
+        active = active[~won]
+
+    return winner, length
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Vektorisiertes Selbstspiel.')
+    parser.add_argument('--games', type=int, default=10000, help='Anzahl der Partien')
+    parser.add_argument('--epsilon', type=float, default=0.1, help='Anteil zufälliger Züge')
+    parser.add_argument('--seed', type=int, help='Startwert des Zufallsgenerators')
+    parser.add_argument('--weights', type=int, nargs=5, default=list(DEFAULT_WEIGHTS),
+                        help='Gewichte des beginnenden Spielers')
+    parser.add_argument('--opponent', type=int, nargs=5, help='Gewichte der KI (Standard: wie --weights)')
+    args = parser.parse_args(argv)
+
+    weights = (tuple(args.weights), tuple(args.opponent or args.weights))
+    start = time.perf_counter()
+    winner, length = self_play(args.games, weights, args.epsilon, args.seed)
+    elapsed = time.perf_counter() - start
+    print('Spieler: %d, KI: %d, Remis: %d' % ((winner == PLAYER_CODE).sum(),
+                                              (winner == AI_CODE).sum(),
+                                              (winner == EMPTY_CODE).sum()))
+    print('Mittlere Länge %.1f Halbzüge, %.0f Partien/s' % (length.mean(), args.games / elapsed))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())